@@ -0,0 +1,121 @@
+import time
+
+
+class AgendadorFisico:
+    """
+    Agendador de passo fixo que desacopla a física da renderização
+
+    A cada quadro, o tempo real decorrido é convertido em tempo simulado (segundo a taxa da
+    simulação) e acumulado. São executados quantos passos de tamanho fixo 'dt' couberem no
+    acumulado, e o que sobra é usado para interpolar as posições desenhadas entre dois passos.
+
+    Quando a física não cabe no orçamento de tempo de um quadro, o quadro deixa de ser desenhado
+    (até 'max_quadros_pulados' seguidos), mas o passo da física nunca é aumentado.
+
+    Atributos:
+        dt (float): intervalo de tempo fixo de cada passo da física
+        taxa (float): tempo simulado por segundo real
+        acumulador (float): tempo simulado ainda não integrado
+        passos_ultimo_quadro (int): passos executados no último quadro
+    """
+
+    def __init__(self, dt, taxa, orcamento=0.012, max_quadros_pulados=3, max_atraso=0.25):
+        """
+        Parâmetros:
+            dt (float): intervalo de tempo fixo de cada passo da física
+            taxa (float): tempo simulado por segundo real
+            orcamento (float): tempo real máximo (em segundos) gasto com física em um quadro
+            max_quadros_pulados (int): quantidade máxima de quadros seguidos sem renderização
+            max_atraso (float): atraso máximo (em segundos reais) acumulado antes de descartar tempo
+        """
+        self.dt = dt
+        self.taxa = taxa
+        self.orcamento = orcamento
+        self.max_quadros_pulados = max_quadros_pulados
+        self.max_atraso = max_atraso
+        self.acumulador = 0.0
+        self.quadros_pulados = 0
+        self.passos_ultimo_quadro = 0
+
+    @property
+    def alpha(self):
+        """
+        Fração do próximo passo já decorrida, usada para interpolar as posições desenhadas
+
+        Retorna:
+            float: valor entre 0 e 1
+        """
+        return min(self.acumulador / self.dt, 1.0)
+
+    def avancar(self, tempo_real, passo):
+        """
+        Executa os passos de física correspondentes ao tempo real decorrido
+
+        1. Acumula o tempo simulado, descartando o que passar do atraso máximo
+        2. Executa passos de tamanho fixo enquanto houver tempo acumulado e orçamento no quadro
+        3. Decide se o quadro deve ser desenhado ou pulado para a física alcançar o tempo real
+
+        Parâmetros:
+            tempo_real (float): tempo real decorrido desde o último quadro, em segundos
+            passo (callable): função que avança a física, chamada como passo(dt)
+
+        Retorna:
+            bool: True se o quadro deve ser desenhado
+        """
+        self.acumulador = min(
+            self.acumulador + tempo_real * self.taxa, self.max_atraso * self.taxa + self.dt
+        )
+
+        inicio = time.perf_counter()
+        passos = 0
+        while self.acumulador >= self.dt:
+            passo(self.dt)
+            self.acumulador -= self.dt
+            passos += 1
+            if time.perf_counter() - inicio > self.orcamento:
+                break
+        self.passos_ultimo_quadro = passos
+
+        # Física atrasada: pula a renderização, mas nunca por muitos quadros seguidos
+        if self.acumulador >= self.dt and self.quadros_pulados < self.max_quadros_pulados:
+            self.quadros_pulados += 1
+            return False
+        self.quadros_pulados = 0
+        return True
+
+
+class PerfilQuadro:
+    """
+    Mede quanto tempo real cada etapa de um quadro consome (eventos, física, renderização...)
+
+    Cada etapa é encerrada com marcar(nome), que atribui a ela o tempo desde a marca anterior.
+    Os tempos são suavizados com uma média móvel exponencial, para que a leitura na tela não
+    oscile a cada quadro.
+
+    Atributos:
+        medias (dict): tempo médio de cada etapa, em segundos, na ordem em que foram marcadas
+        suavizacao (float): peso do quadro atual na média móvel
+    """
+
+    def __init__(self, suavizacao=0.05):
+        self.suavizacao = suavizacao
+        self.medias = {}
+        self._ultima_marca = time.perf_counter()
+
+    def marcar(self, nome):
+        """
+        Encerra uma etapa do quadro
+
+        Parâmetro:
+            nome (str): nome da etapa
+        """
+        agora = time.perf_counter()
+        duracao = agora - self._ultima_marca
+        self._ultima_marca = agora
+        media = self.medias.get(nome)
+        self.medias[nome] = duracao if media is None else media + self.suavizacao * (duracao - media)
+
+    @property
+    def total(self):
+        """float: tempo médio de um quadro inteiro, em segundos"""
+        return sum(self.medias.values())
@@ -0,0 +1,310 @@
+import argparse
+import time
+
+import numpy as np
+
+from condicoesIniciais import criar_corpos
+from fisica import G, aceleracoes_diretas
+
+# Profundidade máxima da árvore (cada nível divide a célula em 4 quadrantes)
+NIVEL_MAXIMO = 20
+
+# Quantidade máxima de corpos em uma folha antes de ela ser subdividida
+CORPOS_POR_FOLHA = 8
+
+# Quantidade de alvos percorrendo a árvore ao mesmo tempo (limita a memória usada)
+ALVOS_POR_BLOCO = 2048
+
+
+def _espalhar_bits(v):
+    """
+    Intercala zeros entre os bits de um inteiro, usado para montar o código de Morton
+
+    Parâmetro:
+        v (np.ndarray): inteiros sem sinal de até 32 bits
+
+    Retorna:
+        np.ndarray: inteiros de 64 bits com os bits originais nas posições pares
+    """
+    v = v.astype(np.uint64)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+
+def _intervalos(inicios, contagens):
+    """
+    Concatena os intervalos [inicio, inicio + contagem) em um único vetor de índices
+
+    Parâmetros:
+        inicios (np.ndarray): início de cada intervalo
+        contagens (np.ndarray): tamanho de cada intervalo
+
+    Retorna:
+        np.ndarray: índices de todos os intervalos, na ordem
+    """
+    total = int(contagens.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    deslocamento = np.repeat(inicios - np.cumsum(contagens) + contagens, contagens)
+    return np.arange(total, dtype=np.int64) + deslocamento
+
+
+class Quadtree:
+    """
+    Quadtree de Barnes–Hut guardada em vetores planos
+
+    A árvore é construída ordenando os corpos pelo código de Morton: cada nó corresponde a um
+    intervalo contíguo de corpos ordenados, de modo que massa e centro de massa de todos os nós
+    são obtidos por somas acumuladas, sem percorrer a árvore em Python.
+
+    Atributos:
+        pos (np.ndarray): posições (M, 2) das fontes, na ordem de Morton
+        massa (np.ndarray): massas (M,) das fontes, na ordem de Morton
+        inicio, fim (np.ndarray): intervalo de corpos de cada nó
+        primeiroFilho, numFilhos (np.ndarray): filhos de cada nó (numFilhos == 0 indica folha)
+        massaNo (np.ndarray): massa total de cada nó
+        centroMassa (np.ndarray): centro de massa (K, 2) de cada nó
+        centro (np.ndarray): centro geométrico (K, 2) da célula de cada nó
+        tamanho (np.ndarray): lado da célula de cada nó
+    """
+
+    def __init__(self, pos, massa, corpos_por_folha=CORPOS_POR_FOLHA):
+        pos = np.asarray(pos, dtype=np.float64).reshape(-1, 2)
+        massa = np.asarray(massa, dtype=np.float64).reshape(-1)
+        n = len(massa)
+
+        # Caixa quadrada que contém todas as fontes
+        minimo = pos.min(axis=0) if n else np.zeros(2)
+        lado = float((pos.max(axis=0) - minimo).max()) if n else 0.0
+        lado = lado * (1 + 1e-9) if lado > 0 else 1.0
+        celulas = 1 << NIVEL_MAXIMO
+        coords = np.minimum(((pos - minimo) / lado * celulas).astype(np.int64), celulas - 1)
+        codigos = _espalhar_bits(coords[:, 0]) | (_espalhar_bits(coords[:, 1]) << np.uint64(1))
+
+        ordem = np.argsort(codigos, kind="stable")
+        self.pos = pos[ordem]
+        self.massa = massa[ordem]
+        coords = coords[ordem]
+        codigos = codigos[ordem]
+
+        # Construção nível a nível: cada nó que ainda tem corpos demais é dividido em quadrantes
+        inicios = [np.array([0])]
+        fins = [np.array([n])]
+        niveis = [np.array([0])]
+        pais = [np.array([-1])]
+        abertos = np.flatnonzero(fins[0] - inicios[0] > corpos_por_folha)
+        total_nos = 1
+        for nivel in range(1, NIVEL_MAXIMO + 1):
+            if len(abertos) == 0:
+                break
+            ant_inicio = inicios[-1][abertos]
+            ant_contagem = fins[-1][abertos] - ant_inicio
+            idx = _intervalos(ant_inicio, ant_contagem)
+            prefixo = codigos[idx] >> np.uint64(2 * (NIVEL_MAXIMO - nivel))
+            # Um novo nó começa sempre que o prefixo muda (intervalos de pais distintos nunca se misturam)
+            quebra = np.ones(len(idx), dtype=bool)
+            quebra[1:] = prefixo[1:] != prefixo[:-1]
+            posicoes = np.flatnonzero(quebra)
+            novo_inicio = idx[posicoes]
+            novo_fim = np.append(idx[posicoes[1:] - 1] + 1, idx[-1] + 1)
+            pai_corpo = np.repeat(abertos + (total_nos - len(inicios[-1])), ant_contagem)
+            inicios.append(novo_inicio)
+            fins.append(novo_fim)
+            niveis.append(np.full(len(novo_inicio), nivel))
+            pais.append(pai_corpo[posicoes])
+            total_nos += len(novo_inicio)
+            if nivel < NIVEL_MAXIMO:
+                abertos = np.flatnonzero(novo_fim - novo_inicio > corpos_por_folha)
+            else:
+                abertos = abertos[:0]
+
+        self.inicio = np.concatenate(inicios)
+        self.fim = np.concatenate(fins)
+        nivelNo = np.concatenate(niveis)
+        pai = np.concatenate(pais)
+
+        # Filhos de um mesmo pai são contíguos porque foram criados na ordem de Morton
+        self.numFilhos = np.bincount(pai[1:], minlength=total_nos)
+        self.primeiroFilho = np.full(total_nos, -1, dtype=np.int64)
+        primeiro = np.ones(total_nos - 1, dtype=bool)
+        primeiro[1:] = pai[2:] != pai[1:-1]
+        self.primeiroFilho[pai[1:][primeiro]] = np.flatnonzero(primeiro) + 1
+
+        # Massa e centro de massa por somas acumuladas sobre os corpos ordenados
+        acumulado = np.zeros((n + 1, 3))
+        np.cumsum(self.massa, out=acumulado[1:, 0])
+        np.cumsum(self.massa * self.pos[:, 0], out=acumulado[1:, 1])
+        np.cumsum(self.massa * self.pos[:, 1], out=acumulado[1:, 2])
+        soma = acumulado[self.fim] - acumulado[self.inicio]
+        self.massaNo = soma[:, 0]
+        self.centroMassa = np.zeros((total_nos, 2))
+        com_massa = self.massaNo > 0
+        self.centroMassa[com_massa] = soma[com_massa, 1:] / self.massaNo[com_massa, None]
+
+        # Geometria das células, usada no critério de abertura
+        self.tamanho = lado / (1 << nivelNo).astype(np.float64)
+        if n:
+            celula = coords[np.minimum(self.inicio, n - 1)] >> (NIVEL_MAXIMO - nivelNo)[:, None]
+        else:
+            celula = np.zeros((total_nos, 2), dtype=np.int64)
+        self.centro = minimo + (celula + 0.5) * self.tamanho[:, None]
+
+    def __len__(self):
+        return len(self.inicio)
+
+    def aceleracoes(self, alvos, theta=0.5, saida=None, alvos_por_bloco=ALVOS_POR_BLOCO):
+        """
+        Calcula a aceleração de cada alvo percorrendo a árvore
+
+        1. Começa com todos os alvos associados à raiz
+        2. Um nó é aceito como massa pontual se lado / distância < theta e o alvo está fora da célula
+        3. Folhas não aceitas são somadas corpo a corpo (ignorando distância nula)
+        4. Os demais nós são substituídos pelos seus filhos e o processo se repete
+
+        Todos os pares (alvo, nó) de uma mesma etapa são processados juntos com o NumPy.
+
+        Parâmetros:
+            alvos (np.ndarray): posições (N, 2) onde a aceleração será calculada
+            theta (float): ângulo de abertura (0 equivale à soma direta)
+            saida (np.ndarray): vetor (N, 2) opcional onde o resultado será escrito
+            alvos_por_bloco (int): quantidade de alvos percorrendo a árvore ao mesmo tempo
+
+        Retorna:
+            np.ndarray: acelerações (N, 2) dos alvos
+        """
+        alvos = np.asarray(alvos, dtype=np.float64).reshape(-1, 2)
+        n = len(alvos)
+        if saida is None:
+            saida = np.empty((n, 2))
+        saida[:] = 0.0
+        if n == 0 or len(self.massa) == 0:
+            return saida
+
+        theta2 = theta * theta
+        for bloco in range(0, n, alvos_por_bloco):
+            p = alvos[bloco:bloco + alvos_por_bloco]
+            m = len(p)
+            ax = np.zeros(m)
+            ay = np.zeros(m)
+            alvo = np.arange(m)
+            no = np.zeros(m, dtype=np.int64)
+            while len(alvo):
+                pa = p[alvo]
+                dx = self.centroMassa[no, 0] - pa[:, 0]
+                dy = self.centroMassa[no, 1] - pa[:, 1]
+                dist2 = dx * dx + dy * dy
+                tam = self.tamanho[no]
+                dentro = np.all(np.abs(pa - self.centro[no]) <= 0.5 * tam[:, None], axis=1)
+                aceito = (tam * tam < theta2 * dist2) & ~dentro
+                folha = self.numFilhos[no] == 0
+
+                # Nós distantes: contribuição do centro de massa
+                a = np.flatnonzero(aceito)
+                if len(a):
+                    fator = G * self.massaNo[no[a]] / (dist2[a] * np.sqrt(dist2[a]))
+                    ax += np.bincount(alvo[a], dx[a] * fator, minlength=m)
+                    ay += np.bincount(alvo[a], dy[a] * fator, minlength=m)
+
+                # Folhas próximas: soma direta sobre os corpos da folha
+                f = np.flatnonzero(folha & ~aceito)
+                if len(f):
+                    contagem = self.fim[no[f]] - self.inicio[no[f]]
+                    corpo = _intervalos(self.inicio[no[f]], contagem)
+                    alvo_corpo = np.repeat(alvo[f], contagem)
+                    cx = self.pos[corpo, 0] - p[alvo_corpo, 0]
+                    cy = self.pos[corpo, 1] - p[alvo_corpo, 1]
+                    d2 = cx * cx + cy * cy
+                    d3 = d2 * np.sqrt(d2)
+                    fator = np.divide(G * self.massa[corpo], d3, out=np.zeros_like(d3), where=d3 != 0)
+                    ax += np.bincount(alvo_corpo, cx * fator, minlength=m)
+                    ay += np.bincount(alvo_corpo, cy * fator, minlength=m)
+
+                # Nós internos próximos: desce para os filhos
+                r = np.flatnonzero(~aceito & ~folha)
+                contagem = self.numFilhos[no[r]]
+                alvo = np.repeat(alvo[r], contagem)
+                no = _intervalos(self.primeiroFilho[no[r]], contagem)
+
+            saida[bloco:bloco + m, 0] = ax
+            saida[bloco:bloco + m, 1] = ay
+        return saida
+
+
+def aceleracoes_barnes_hut(alvos, fontes, massa_fontes, saida=None, theta=0.5):
+    """
+    Cálculo das acelerações gravitacionais pelo método de Barnes–Hut (O(N log N))
+
+    Tem a mesma assinatura de aceleracoes_diretas, podendo substituí-la no motor de física.
+    A árvore é reconstruída a cada chamada, ou seja, a cada passo da simulação.
+
+    Parâmetros:
+        alvos (np.ndarray): posições (N, 2) dos corpos cuja aceleração será calculada
+        fontes (np.ndarray): posições (M, 2) dos corpos que exercem a força
+        massa_fontes (np.ndarray): massas (M,) dos corpos que exercem a força
+        saida (np.ndarray): vetor (N, 2) opcional onde o resultado será escrito
+        theta (float): ângulo de abertura da árvore
+
+    Retorna:
+        np.ndarray: acelerações (N, 2) dos alvos
+    """
+    return Quadtree(fontes, massa_fontes).aceleracoes(alvos, theta=theta, saida=saida)
+
+
+def relatorio_precisao(pos, massa, thetas=(0.3, 0.5, 0.7, 1.0)):
+    """
+    Compara as acelerações de Barnes–Hut com as do kernel exato para vários ângulos de abertura
+
+    O erro de cada corpo é |a_bh - a_exata| / |a_exata|. Corpos cuja aceleração quase se cancela
+    (como o Sol no centro de um cinturão simétrico) dominam o erro máximo.
+
+    Parâmetros:
+        pos (np.ndarray): posições (N, 2) dos corpos
+        massa (np.ndarray): massas (N,) dos corpos
+        thetas (iterable): ângulos de abertura a serem avaliados
+
+    Retorna:
+        list: um dicionário por theta com os erros relativos (médio, p99 e máximo) e os tempos
+    """
+    inicio = time.perf_counter()
+    exata = aceleracoes_diretas(pos, pos, massa)
+    tempo_direto = time.perf_counter() - inicio
+    modulo = np.hypot(exata[:, 0], exata[:, 1])
+    valido = modulo > 0
+
+    resultados = []
+    for theta in thetas:
+        inicio = time.perf_counter()
+        aprox = aceleracoes_barnes_hut(pos, pos, massa, theta=theta)
+        tempo_bh = time.perf_counter() - inicio
+        erro = np.hypot(*(aprox - exata)[valido].T) / modulo[valido]
+        resultados.append(
+            {
+                "theta": theta,
+                "erro_medio": float(erro.mean()),
+                "erro_p99": float(np.percentile(erro, 99)),
+                "erro_max": float(erro.max()),
+                "tempo_bh": tempo_bh,
+                "tempo_direto": tempo_direto,
+            }
+        )
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Relatório de precisão do Barnes–Hut contra o kernel exato")
+    parser.add_argument("--corpos", type=int, default=5000, help="quantidade de asteroides no cinturão")
+    parser.add_argument("--thetas", type=float, nargs="+", default=[0.3, 0.5, 0.7, 1.0])
+    args = parser.parse_args()
+
+    corpos = criar_corpos(args.corpos, seed=0)
+    pos, massa = corpos.pos, corpos.massa
+    print(f"{'theta':>6} {'erro médio':>12} {'erro p99':>12} {'erro máx':>12} {'BH (s)':>9} {'direto (s)':>11}")
+    for r in relatorio_precisao(pos, massa, args.thetas):
+        print(
+            f"{r['theta']:>6.2f} {r['erro_medio']:>12.3e} {r['erro_p99']:>12.3e} "
+            f"{r['erro_max']:>12.3e} {r['tempo_bh']:>9.3f} {r['tempo_direto']:>11.3f}"
+        )
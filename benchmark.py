@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    # Indisponível no Windows: o pico de memória residente não é medido
+    resource = None
+
+from condicoesIniciais import INTEGRADOR, METODO_GRAVIDADE, THETA_BARNES_HUT, criar_corpos, timeStep
+from fisica import MotorFisico
+from integradores import INTEGRADORES
+
+# Quantidade de corpos padrão: o sistema da visualização (Sol, 8 planetas e 250 asteroides) até 10 mil
+CORPOS_PADRAO = [259, 1000, 5000, 10000]
+
+
+def _cronometrar(funcao, repeticoes, tempo_minimo):
+    """
+    Executa uma função repetidas vezes e mede cada execução
+
+    Parâmetros:
+        funcao (callable): função sem argumentos
+        repeticoes (int): quantidade mínima de execuções
+        tempo_minimo (float): tempo mínimo total de medição em segundos
+
+    Retorna:
+        np.ndarray: duração de cada execução, em segundos
+    """
+    tempos = []
+    inicio = time.perf_counter()
+    while len(tempos) < repeticoes or time.perf_counter() - inicio < tempo_minimo:
+        t0 = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - t0)
+    return np.array(tempos)
+
+
+def medir(
+    num_corpos,
+    metodo=METODO_GRAVIDADE,
+    integrador=INTEGRADOR,
+    processos=1,
+    particulas_teste=True,
+    dt=timeStep,
+    passos=20,
+    tempo_minimo=1.0,
+    passos_memoria=10,
+):
+    """
+    Mede o desempenho do laço de física para uma configuração
+
+    1. Aquece o motor (primeira avaliação, pool de processos e memórias compartilhadas)
+    2. Mede o tempo de cada passo completo e de cada avaliação de força isolada
+    3. Com tracemalloc ativo, mede a memória alocada temporariamente em cada passo e o quanto a
+       memória cresce de um passo para o outro (vazamentos)
+    4. Lê o pico de memória residente do processo
+
+    Parâmetros:
+        num_corpos (int): quantidade total de corpos (Sol, planetas e asteroides)
+        metodo (str): método usado no cálculo da gravidade
+        integrador (str): integrador usado em cada passo
+        processos (int): quantidade de processos usados no cálculo da gravidade
+        particulas_teste (bool): cria os asteroides como partículas de teste
+        dt (float): intervalo de tempo de cada passo
+        passos (int): quantidade mínima de passos medidos
+        tempo_minimo (float): tempo mínimo de medição, em segundos, de cada grandeza
+        passos_memoria (int): quantidade de passos medidos com tracemalloc
+
+    Retorna:
+        dict: configuração e resultados da medição
+    """
+    corpos = criar_corpos(max(0, num_corpos - 9), seed=0, dt=dt, particulas_teste=particulas_teste)
+    motor = MotorFisico(corpos, metodo=metodo, theta=THETA_BARNES_HUT, processos=processos, integrador=integrador)
+    try:
+        motor.passo(dt)
+        avaliacoes = motor.avaliacoes
+        tempos_passo = _cronometrar(lambda: motor.passo(dt), passos, tempo_minimo)
+        avaliacoes_por_passo = (motor.avaliacoes - avaliacoes) / len(tempos_passo)
+        tempos_forca = _cronometrar(motor.aceleracoes, passos, tempo_minimo)
+
+        # O tracemalloc deixa as alocações mais lentas: a memória é medida à parte dos tempos
+        tracemalloc.start()
+        temporaria, crescimento = [], []
+        for _ in range(passos_memoria):
+            antes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            motor.passo(dt)
+            atual, pico = tracemalloc.get_traced_memory()
+            temporaria.append(pico - antes)
+            crescimento.append(atual - antes)
+        tracemalloc.stop()
+    finally:
+        motor.fechar()
+
+    mediana_passo = float(np.median(tempos_passo))
+    return {
+        "corpos": len(corpos),
+        "metodo": metodo,
+        "integrador": integrador,
+        "processos": processos,
+        "particulas_teste": particulas_teste,
+        "passos_medidos": len(tempos_passo),
+        "tempo_passo": mediana_passo,
+        "passos_por_segundo": 1 / mediana_passo,
+        "tempo_forca": float(np.median(tempos_forca)),
+        "avaliacoes_por_passo": avaliacoes_por_passo,
+        "memoria_temporaria_por_passo": float(np.median(temporaria)),
+        "crescimento_por_passo": float(np.mean(crescimento)),
+        "pico_rss": pico_rss(),
+    }
+
+
+def pico_rss():
+    """
+    Pico de memória residente do processo atual
+
+    Retorna:
+        int: pico de memória residente em bytes, ou None se não puder ser medido
+    """
+    if resource is None:
+        return None
+    # ru_maxrss é dado em KB no Linux e em bytes no macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def _medir_isolado(opcoes):
+    """
+    Executa medir em um processo novo, para que o pico de memória residente seja só o da configuração
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(medir, **opcoes).result()
+
+
+def ambiente():
+    """
+    Descreve a máquina e as versões usadas, para que resultados de máquinas diferentes não sejam confundidos
+
+    Retorna:
+        dict: informações do ambiente
+    """
+    return {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "nucleos": os.cpu_count(),
+    }
+
+
+def comparar(resultados, referencia, tolerancia=0.1):
+    """
+    Compara os resultados com uma execução anterior e aponta regressões de velocidade
+
+    Parâmetros:
+        resultados (list): resultados da execução atual
+        referencia (list): resultados de uma execução anterior (mesmo formato)
+        tolerancia (float): perda relativa de passos por segundo aceita antes de apontar regressão
+
+    Retorna:
+        list: tuplas (resultado atual, resultado de referência, variação relativa) das regressões
+    """
+
+    def chave(r):
+        return r["corpos"], r["metodo"], r["integrador"], r["processos"], r["particulas_teste"]
+
+    anteriores = {chave(r): r for r in referencia}
+    regressoes = []
+    for r in resultados:
+        anterior = anteriores.get(chave(r))
+        if anterior is None:
+            continue
+        variacao = r["passos_por_segundo"] / anterior["passos_por_segundo"] - 1
+        if variacao < -tolerancia:
+            regressoes.append((r, anterior, variacao))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Desempenho do laço de física sem tela")
+    parser.add_argument("--corpos", type=int, nargs="+", default=CORPOS_PADRAO)
+    parser.add_argument("--metodos", nargs="+", choices=["direto", "barnes-hut"], default=[METODO_GRAVIDADE])
+    parser.add_argument("--integradores", nargs="+", choices=list(INTEGRADORES), default=[INTEGRADOR])
+    parser.add_argument("--processos", type=int, nargs="+", default=[1])
+    parser.add_argument(
+        "--asteroides-massivos",
+        action="store_true",
+        help="faz os asteroides exercerem força (problema de N corpos completo)",
+    )
+    parser.add_argument("--tempo-minimo", type=float, default=1.0, help="segundos de medição por grandeza")
+    parser.add_argument("--saida", default=None, help="arquivo JSON onde os resultados serão gravados")
+    parser.add_argument("--comparar", default=None, help="arquivo JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.1, help="perda relativa aceita na comparação")
+    args = parser.parse_args()
+
+    print(
+        f"{'corpos':>7} {'método':>10} {'integrador':>10} {'proc':>4} {'passos/s':>10} {'força (ms)':>10} "
+        f"{'temp./passo':>11} {'cresc./passo':>12} {'pico RSS':>9}"
+    )
+    resultados = []
+    for metodo in args.metodos:
+        for integrador in args.integradores:
+            for processos in args.processos:
+                for num_corpos in args.corpos:
+                    r = _medir_isolado(
+                        {
+                            "num_corpos": num_corpos,
+                            "metodo": metodo,
+                            "integrador": integrador,
+                            "processos": processos,
+                            "particulas_teste": not args.asteroides_massivos,
+                            "tempo_minimo": args.tempo_minimo,
+                        }
+                    )
+                    resultados.append(r)
+                    print(
+                        f"{r['corpos']:>7} {metodo:>10} {integrador:>10} {processos:>4} "
+                        f"{r['passos_por_segundo']:>10.1f} {r['tempo_forca'] * 1e3:>10.3f} "
+                        f"{r['memoria_temporaria_por_passo'] / 1024:>8.0f} KB "
+                        f"{r['crescimento_por_passo']:>10.0f} B {(r['pico_rss'] or 0) / 2**20:>6.0f} MB"
+                    )
+
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            json.dump({"ambiente": ambiente(), "resultados": resultados}, arquivo, indent=2)
+        print(f"Resultados gravados em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            referencia = json.load(arquivo)["resultados"]
+        regressoes = comparar(resultados, referencia, args.tolerancia)
+        for r, anterior, variacao in regressoes:
+            print(
+                f"Regressão: {r['corpos']} corpos, {r['metodo']}, {r['integrador']}, {r['processos']} processo(s): "
+                f"{anterior['passos_por_segundo']:.1f} -> {r['passos_por_segundo']:.1f} passos/s ({variacao:+.0%})"
+            )
+        if regressoes:
+            sys.exit(1)
+        print("Nenhuma regressão em relação à referência")
+
+
+if __name__ == "__main__":
+    main()
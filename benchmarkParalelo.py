@@ -0,0 +1,70 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from condicoesIniciais import criar_corpos
+from fisica import MotorFisico
+
+
+def medir(num_corpos, processos, metodo="direto", repeticoes=3, tempo_minimo=1.0):
+    """
+    Mede o tempo de uma avaliação completa das acelerações para uma quantidade de corpos
+
+    Todos os corpos são massivos, de forma que o custo é o do problema de N corpos completo.
+    A primeira avaliação é descartada (aquecimento do pool e das memórias compartilhadas).
+
+    Parâmetros:
+        num_corpos (int): quantidade total de corpos (Sol, planetas e asteroides)
+        processos (int): quantidade de processos usados no cálculo
+        metodo (str): método usado no cálculo da gravidade
+        repeticoes (int): quantidade mínima de avaliações medidas
+        tempo_minimo (float): tempo mínimo de medição em segundos
+
+    Retorna:
+        float: mediana do tempo de uma avaliação, em segundos
+    """
+    corpos = criar_corpos(max(0, num_corpos - 9), seed=0, particulas_teste=False)
+    motor = MotorFisico(corpos, metodo=metodo, processos=processos)
+    try:
+        motor.aceleracoes()
+        tempos = []
+        inicio = time.perf_counter()
+        while len(tempos) < repeticoes or time.perf_counter() - inicio < tempo_minimo:
+            t0 = time.perf_counter()
+            motor.aceleracoes()
+            tempos.append(time.perf_counter() - t0)
+            if len(tempos) >= repeticoes and tempos[-1] > tempo_minimo:
+                break
+        return float(np.median(tempos))
+    finally:
+        motor.fechar()
+
+
+def main():
+    nucleos = os.cpu_count()
+    padrao_processos = sorted({1, *[2**k for k in range(1, nucleos.bit_length()) if 2**k <= nucleos], nucleos})
+
+    parser = argparse.ArgumentParser(description="Escalonamento do cálculo paralelo da gravidade")
+    parser.add_argument("--corpos", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--processos", type=int, nargs="+", default=padrao_processos)
+    parser.add_argument("--metodo", choices=["direto", "barnes-hut"], default="direto")
+    args = parser.parse_args()
+
+    print(f"Núcleos disponíveis: {nucleos}")
+    print(f"{'corpos':>8} {'processos':>9} {'tempo (s)':>10} {'pares/s':>10} {'speedup':>8} {'eficiência':>10}")
+    for num_corpos in args.corpos:
+        base = None
+        for processos in args.processos:
+            tempo = medir(num_corpos, processos, args.metodo)
+            base = base or tempo
+            speedup = base / tempo
+            print(
+                f"{num_corpos:>8} {processos:>9} {tempo:>10.4f} {num_corpos**2 / tempo:>10.2e} "
+                f"{speedup:>8.2f} {speedup / processos:>10.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
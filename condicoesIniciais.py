@@ -0,0 +1,148 @@
+import math
+import random
+
+import numpy as np
+
+from corpos import BodySystem
+from fisica import G
+
+# Constantes físicas utilizadas na simulação
+massaSol = 1.989e10
+tamanhoSol = 1392.700
+distanciaPlanetas = [57.9, 108.2, 149.6, 227.9, 778.5, 1432.0, 2867.0, 4515.0]
+massaPlanetas = [3.28e3, 4.83e4, 5.98e4, 6.40e3, 1.90e7, 5.68e6, 8.67e5, 1.05e6]
+tamanhoPlanetas = [4.879, 12.104, 12.756, 6.798, 142.964, 120.536, 51.118, 49.572]
+coresPlanetas = [
+    (169, 169, 169),
+    (255, 215, 0),
+    (0, 191, 255),
+    (188, 39, 50),
+    (255, 140, 0),
+    (210, 180, 140),
+    (0, 255, 255),
+    (25, 25, 112),
+]
+nomesPlanetas = [
+    "Mercúrio",
+    "Vênus",
+    "Terra",
+    "Marte",
+    "Júpiter",
+    "Saturno",
+    "Urano",
+    "Netuno",
+]
+
+# Posição inicial do Sol (centro da tela de 1920x1080 usada na visualização)
+CENTRO = (1920 // 2, 1080 // 2)
+
+# Parâmetros de simulação
+timeStep = 1e1  # Intervalo de tempo para cada iteração da simulação
+METODO_GRAVIDADE = "direto"  # "direto" (soma exata O(N²)) ou "barnes-hut" (quadtree O(N log N))
+THETA_BARNES_HUT = 0.5  # Ângulo de abertura do Barnes–Hut (menor = mais preciso e mais lento)
+PROCESSOS_GRAVIDADE = 1  # Processos usados no cálculo da gravidade (acima de 1 usa memória compartilhada)
+INTEGRADOR = "verlet"  # "verlet", "leapfrog", "yoshida4" ou "adaptativo" (ver integradores.py)
+
+# Ano da simulação: período da órbita circular da Terra (em unidades de tempo da simulação)
+ANO_SIMULADO = 2 * math.pi * math.sqrt((distanciaPlanetas[2] + tamanhoSol / 2) ** 3 / (G * massaSol))
+
+# Configurações da área do cinturão de asteroides
+ASTEROID_BELT_INNER_RADIUS = 300 + (tamanhoSol / 2)  # Milhões de km
+ASTEROID_BELT_OUTER_RADIUS = 500 + (tamanhoSol / 2)  # Milhões de km
+NUM_ASTEROIDS = 250
+# Asteroides como partículas de teste: sentem a gravidade do Sol e dos planetas, mas não exercem força
+ASTEROIDES_PARTICULAS_TESTE = True
+
+
+def orbita_circular(raio, angulo, dt):
+    """
+    Calcula posição, velocidade e posição anterior de corpos em órbita circular ao redor do Sol
+
+    O sentido da velocidade é perpendicular ao vetor entre o corpo e o Sol.
+
+    Parâmetros:
+        raio (float ou np.ndarray): distância do corpo ao centro do Sol
+        angulo (float ou np.ndarray): ângulo da posição inicial em radianos
+        dt (float): intervalo de tempo usado para calcular a posição anterior
+
+    Retorna:
+        tuple: posições, posições anteriores e velocidades, como vetores (K, 2)
+    """
+    raio = np.atleast_1d(np.asarray(raio, dtype=np.float64))
+    angulo = np.atleast_1d(np.asarray(angulo, dtype=np.float64))
+    direcao = np.column_stack([np.cos(angulo), np.sin(angulo)])
+    pos = np.asarray(CENTRO, dtype=np.float64) + direcao * raio[:, None]
+    # Calcula velocidade orbital com base na velocidade circular
+    velOrb = np.sqrt(G * massaSol / raio)
+    vel = np.column_stack([-direcao[:, 1], direcao[:, 0]]) * velOrb[:, None]
+    # Posição anterior calculada retroativamente
+    antPos = pos - vel * dt
+    return pos, antPos, vel
+
+
+def criar_corpos(
+    num_asteroides=NUM_ASTEROIDS,
+    seed=None,
+    dt=timeStep,
+    raio_interno=ASTEROID_BELT_INNER_RADIUS,
+    raio_externo=ASTEROID_BELT_OUTER_RADIUS,
+    particulas_teste=ASTEROIDES_PARTICULAS_TESTE,
+    escala_massas=1.0,
+):
+    """
+    Cria o Sol, os planetas e os asteroides com suas condições iniciais
+
+    Não depende do pygame, de forma que a mesma função serve tanto para a visualização quanto
+    para as execuções sem tela. O Sol fica no índice 0, seguido dos planetas e dos asteroides.
+
+    Parâmetros:
+        num_asteroides (int): quantidade de asteroides no cinturão
+        seed (int): semente do gerador aleatório dos asteroides (None para não fixar)
+        dt (float): intervalo de tempo usado para calcular as posições anteriores
+        raio_interno, raio_externo (float): limites do cinturão de asteroides
+        particulas_teste (bool): cria os asteroides como partículas de teste
+        escala_massas (float): fator aplicado às massas dos planetas
+
+    Retorna:
+        BodySystem: corpos da simulação
+    """
+    corpos = BodySystem(capacidade=1 + len(massaPlanetas) + num_asteroides)
+
+    # Inicialização do Sol, parado no centro
+    corpos.adicionar(massaSol, tamanhoSol / 2, CENTRO, (0.0, 0.0), nome="Sol", cor=(255, 255, 0))
+
+    # Inicialização dos planetas
+    distancias = np.array(distanciaPlanetas) + (tamanhoSol / 2)
+    pos, antPos, vel = orbita_circular(distancias, np.arange(len(massaPlanetas)) * (math.pi / 4), dt)
+    corpos.adicionar_lote(
+        np.array(massaPlanetas) * escala_massas,
+        np.array(tamanhoPlanetas) / 2,
+        pos,
+        vel,
+        antPos,
+        nome=nomesPlanetas,
+        cor=coresPlanetas,
+        raioOrbital=distancias,
+    )
+
+    # Inicialização dos asteroides
+    # Gera uma população de asteroides no cinturão de asteroides com posições e velocidades aleatórias
+    rng = random.Random(seed)
+    sorteios = np.array(
+        [
+            (
+                rng.uniform(raio_interno, raio_externo),
+                rng.uniform(0, 2 * math.pi),
+                rng.uniform(1e-6, 1e-4),
+                rng.uniform(0.1, 2),
+            )
+            for _ in range(num_asteroides)
+        ]
+    ).reshape(-1, 4)
+    raio_aleatorio, angulo, massa_asteroide, tamanho_asteroide = sorteios.T
+    pos, antPos, vel = orbita_circular(raio_aleatorio, angulo, dt)
+    corpos.adicionar_lote(
+        massa_asteroide, tamanho_asteroide / 2, pos, vel, antPos, particulaTeste=particulas_teste
+    )
+
+    return corpos
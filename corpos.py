@@ -0,0 +1,221 @@
+import numpy as np
+
+# Cor padrão dos corpos sem cor própria (asteroides)
+COR_PADRAO = (150, 150, 150)
+
+# Vetores numéricos guardados para cada corpo: nome -> (formato por corpo, tipo, valor inicial)
+_CAMPOS = {
+    "pos": ((2,), np.float64, 0.0),
+    "antPos": ((2,), np.float64, 0.0),
+    "vel": ((2,), np.float64, 0.0),
+    "massa": ((), np.float64, 0.0),
+    "raio": ((), np.float64, 0.0),
+    "raioOrbital": ((), np.float64, np.nan),
+    "particulaTeste": ((), np.bool_, False),
+}
+
+
+class BodySystem:
+    """
+    Armazena todos os corpos da simulação em vetores contíguos (estrutura de vetores)
+
+    Em vez de um dicionário com três pygame.Vector2 por corpo, cada grandeza fica em um único
+    vetor do NumPy, e nomes e cores ficam em listas paralelas. Os vetores têm folga de
+    capacidade, de forma que adicionar corpos raramente exige realocação, e o motor de física
+    atualiza os vetores no próprio lugar, sem alocações por corpo a cada passo.
+
+    As propriedades pos, antPos, vel, massa, raio, raioOrbital e particulaTeste são visões dos
+    primeiros 'len(corpos)' elementos de cada vetor. Depois de adicionar ou remover corpos as
+    visões antigas deixam de valer e devem ser obtidas novamente. Quem alterar particulaTeste
+    diretamente deve incrementar 'versao' para o motor de física recalcular as fontes.
+
+    Atributos:
+        nomes (list): nome de cada corpo ("" para corpos sem nome)
+        cores (list): cor RGB de cada corpo
+        versao (int): incrementada sempre que corpos são adicionados ou removidos
+    """
+
+    def __init__(self, capacidade=16, alocar=np.zeros):
+        """
+        Parâmetros:
+            capacidade (int): quantidade de corpos reservada inicialmente
+            alocar (callable): função que cria os vetores, chamada como alocar(formato, tipo)
+        """
+        self._alocar = alocar
+        self._liberar = None
+        self._n = 0
+        self._capacidade = 0
+        self._vetores = {}
+        self.nomes = []
+        self.cores = []
+        self.versao = 0
+        self._reservar(max(1, capacidade))
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def pos(self):
+        """np.ndarray: posições atuais (N, 2)"""
+        return self._vetores["pos"][: self._n]
+
+    @property
+    def antPos(self):
+        """np.ndarray: posições no passo anterior (N, 2)"""
+        return self._vetores["antPos"][: self._n]
+
+    @property
+    def vel(self):
+        """np.ndarray: velocidades (N, 2)"""
+        return self._vetores["vel"][: self._n]
+
+    @property
+    def massa(self):
+        """np.ndarray: massas (N,)"""
+        return self._vetores["massa"][: self._n]
+
+    @property
+    def raio(self):
+        """np.ndarray: raios (N,)"""
+        return self._vetores["raio"][: self._n]
+
+    @property
+    def raioOrbital(self):
+        """np.ndarray: raios das órbitas desenhadas (N,), nan para corpos sem órbita"""
+        return self._vetores["raioOrbital"][: self._n]
+
+    @property
+    def particulaTeste(self):
+        """np.ndarray: indica (N,) os corpos que não exercem força"""
+        return self._vetores["particulaTeste"][: self._n]
+
+    def _reservar(self, capacidade):
+        """
+        Realoca os vetores com uma nova capacidade, copiando os corpos existentes
+
+        Parâmetro:
+            capacidade (int): nova quantidade de corpos reservada
+        """
+        novos = {}
+        for nome, (formato, tipo, inicial) in _CAMPOS.items():
+            vetor = self._alocar((capacidade,) + formato, tipo)
+            vetor[self._n:] = inicial
+            if nome in self._vetores:
+                vetor[: self._n] = self._vetores[nome][: self._n]
+            novos[nome] = vetor
+        antigos, self._vetores = self._vetores, novos
+        self._capacidade = capacidade
+        if self._liberar is not None:
+            for vetor in antigos.values():
+                self._liberar(vetor)
+
+    def usar_alocador(self, alocar, liberar=None):
+        """
+        Passa a criar os vetores com outra função (por exemplo, em memória compartilhada)
+
+        Os corpos existentes são copiados uma única vez para os novos vetores.
+
+        Parâmetros:
+            alocar (callable): função que cria os vetores, chamada como alocar(formato, tipo)
+            liberar (callable): função chamada com cada vetor substituído em uma realocação
+        """
+        self._alocar = alocar
+        self._liberar = liberar
+        self._reservar(self._capacidade)
+        self.versao += 1
+
+    def adicionar_lote(
+        self, massa, raio, pos, vel, antPos=None, nome="", cor=COR_PADRAO, particulaTeste=False, raioOrbital=np.nan
+    ):
+        """
+        Adiciona vários corpos de uma vez
+
+        Parâmetros:
+            massa, raio (np.ndarray): massas e raios (K,) dos corpos
+            pos, vel (np.ndarray): posições e velocidades (K, 2)
+            antPos (np.ndarray): posições no passo anterior (K, 2); se omitidas, iguais a pos
+            nome (str ou list): nome de cada corpo ou um nome comum a todos
+            cor (tuple ou list): cor de cada corpo ou uma cor comum a todos
+            particulaTeste (bool ou np.ndarray): indica os corpos que não exercem força
+            raioOrbital (float ou np.ndarray): raio da órbita desenhada (nan para nenhuma)
+
+        Retorna:
+            range: índices dos corpos adicionados
+        """
+        massa = np.atleast_1d(np.asarray(massa, dtype=np.float64))
+        k = len(massa)
+        inicio = self._n
+        if inicio + k > self._capacidade:
+            self._reservar(max(inicio + k, 2 * self._capacidade))
+        fim = inicio + k
+        v = self._vetores
+        v["massa"][inicio:fim] = massa
+        v["raio"][inicio:fim] = raio
+        v["pos"][inicio:fim] = np.reshape(pos, (k, 2))
+        v["vel"][inicio:fim] = np.reshape(vel, (k, 2))
+        v["antPos"][inicio:fim] = v["pos"][inicio:fim] if antPos is None else np.reshape(antPos, (k, 2))
+        v["particulaTeste"][inicio:fim] = particulaTeste
+        v["raioOrbital"][inicio:fim] = raioOrbital
+        self.nomes.extend([nome] * k if isinstance(nome, str) else nome)
+        self.cores.extend([cor] * k if isinstance(cor, tuple) else cor)
+        self._n = fim
+        self.versao += 1
+        return range(inicio, fim)
+
+    def adicionar(
+        self, massa, raio, pos, vel, antPos=None, nome="", cor=COR_PADRAO, particulaTeste=False, raioOrbital=np.nan
+    ):
+        """
+        Adiciona um corpo
+
+        Parâmetros:
+            massa, raio (float): massa e raio do corpo
+            pos, vel (tuple): posição e velocidade (x, y)
+            antPos (tuple): posição no passo anterior; se omitida, igual a pos
+            nome (str): nome do corpo
+            cor (tuple): cor RGB do corpo
+            particulaTeste (bool): o corpo sente a gravidade, mas não exerce força
+            raioOrbital (float): raio da órbita desenhada (nan para nenhuma)
+
+        Retorna:
+            int: índice do corpo adicionado
+        """
+        return self.adicionar_lote(
+            massa, raio, pos, vel, antPos, nome, cor, particulaTeste, raioOrbital
+        ).start
+
+    def remover(self, indices):
+        """
+        Remove corpos, mantendo a ordem dos demais
+
+        Parâmetro:
+            indices (int ou iterable): índices dos corpos removidos
+
+        Retorna:
+            np.ndarray: novo índice de cada corpo antigo (-1 para os removidos)
+        """
+        manter = np.ones(self._n, dtype=bool)
+        manter[np.asarray(indices, dtype=np.int64)] = False
+        restantes = int(manter.sum())
+        for vetor in self._vetores.values():
+            vetor[:restantes] = vetor[: self._n][manter]
+        self.nomes = [nome for nome, m in zip(self.nomes, manter) if m]
+        self.cores = [cor for cor, m in zip(self.cores, manter) if m]
+        novo_indice = np.full(self._n, -1, dtype=np.int64)
+        novo_indice[manter] = np.arange(restantes)
+        self._n = restantes
+        self.versao += 1
+        return novo_indice
+
+    def atualizar_antPos(self, dt):
+        """
+        Recalcula as posições anteriores a partir das velocidades atuais
+
+        Usado para corrigir a posição anterior quando o intervalo de tempo é modificado
+
+        Parâmetro:
+            dt (float): novo intervalo de tempo
+        """
+        antPos = self.antPos
+        np.multiply(self.vel, -dt, out=antPos)
+        antPos += self.pos
@@ -0,0 +1,260 @@
+import argparse
+import itertools
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from condicoesIniciais import (
+    ANO_SIMULADO,
+    ASTEROID_BELT_INNER_RADIUS,
+    ASTEROID_BELT_OUTER_RADIUS,
+    INTEGRADOR,
+    METODO_GRAVIDADE,
+    NUM_ASTEROIDS,
+    THETA_BARNES_HUT,
+    criar_corpos,
+    nomesPlanetas,
+    timeStep,
+)
+from fisica import MotorFisico, elementos_orbitais
+from integradores import INTEGRADORES, Diagnostico
+
+# Distância ao Sol (em múltiplos da órbita de Netuno) a partir da qual um corpo é considerado ejetado
+RAIO_EJECAO = 3.0
+
+SOL = 0
+inicioAsteroides = 1 + len(nomesPlanetas)
+
+
+def grade_parametros(**valores):
+    """
+    Monta todas as combinações de uma grade de parâmetros
+
+    Parâmetros:
+        **valores (list): valores possíveis de cada parâmetro
+
+    Retorna:
+        list: um dict por combinação, na ordem da grade
+    """
+    nomes = list(valores)
+    return [dict(zip(nomes, combinacao)) for combinacao in itertools.product(*valores.values())]
+
+
+def _elementos(motor):
+    """
+    Semieixos maiores, excentricidades e distâncias ao Sol de todos os corpos, exceto o Sol
+    """
+    corpos = motor.corpos
+    pos, vel, massa = corpos.pos, corpos.vel, corpos.massa
+    a, e, _ = elementos_orbitais(pos[1:], vel[1:], massa[1:], pos[SOL], vel[SOL], massa[SOL])
+    distancia = np.hypot(*(pos[1:] - pos[SOL]).T)
+    return a, e, distancia
+
+
+def _estatisticas_deriva(a0, e0, a, e, manter):
+    """
+    Variação dos elementos orbitais dos corpos selecionados entre o início e o fim
+
+    Retorna:
+        dict: média e máximo de |Δa/a| e de |Δe|
+    """
+    if not manter.any():
+        return {"deriva_a_media": None, "deriva_a_max": None, "deriva_e_media": None, "deriva_e_max": None}
+    deriva_a = np.abs(a[manter] / a0[manter] - 1)
+    deriva_e = np.abs(e[manter] - e0[manter])
+    return {
+        "deriva_a_media": float(deriva_a.mean()),
+        "deriva_a_max": float(deriva_a.max()),
+        "deriva_e_media": float(deriva_e.mean()),
+        "deriva_e_max": float(deriva_e.max()),
+    }
+
+
+def executar_configuracao(parametros, anos, metodo=METODO_GRAVIDADE, integrador=INTEGRADOR):
+    """
+    Executa uma simulação sem tela e resume a estabilidade do cinturão e das órbitas
+
+    Um corpo é considerado ejetado se, ao final, sua órbita em torno do Sol não é ligada
+    (energia específica ≥ 0) ou se está a mais de RAIO_EJECAO vezes a distância de Netuno. A
+    deriva dos elementos orbitais considera apenas os corpos que não foram ejetados.
+
+    Parâmetros:
+        parametros (dict): seed, raio_interno, raio_externo, num_asteroides, escala_massas e dt
+        anos (float): tempo simulado em anos
+        metodo (str): método usado no cálculo da gravidade
+        integrador (str): integrador usado em cada passo
+
+    Retorna:
+        dict: parâmetros e estatísticas da execução
+    """
+    inicio = time.perf_counter()
+    dt = parametros["dt"]
+    corpos = criar_corpos(
+        parametros["num_asteroides"],
+        seed=parametros["seed"],
+        dt=dt,
+        raio_interno=parametros["raio_interno"],
+        raio_externo=parametros["raio_externo"],
+        escala_massas=parametros["escala_massas"],
+    )
+    motor = MotorFisico(corpos, metodo=metodo, theta=THETA_BARNES_HUT, integrador=integrador)
+    try:
+        a0, e0, _ = _elementos(motor)
+        raio_ejecao = RAIO_EJECAO * corpos.raioOrbital[inicioAsteroides - 1]
+        diagnostico = Diagnostico(motor, ANO_SIMULADO)
+        diagnostico.registrar(0.0)
+
+        passos = max(1, int(round(anos * ANO_SIMULADO / dt)))
+        for _ in range(passos):
+            motor.passo(dt)
+        diagnostico.registrar(passos * dt)
+
+        a, e, distancia = _elementos(motor)
+    finally:
+        motor.fechar()
+
+    ejetado = ~np.isfinite(a) | (distancia > raio_ejecao)
+    asteroide = np.arange(1, len(corpos)) >= inicioAsteroides
+    num_asteroides = int(asteroide.sum())
+    ejetados = int((ejetado & asteroide).sum())
+    resumo = diagnostico.resumo()
+    return {
+        "parametros": parametros,
+        "passos": passos,
+        "anos": passos * dt / ANO_SIMULADO,
+        "asteroides_ejetados": ejetados,
+        "fracao_ejetada": ejetados / num_asteroides if num_asteroides else 0.0,
+        "planetas_ejetados": [nomesPlanetas[i] for i in np.flatnonzero(ejetado & ~asteroide)],
+        "asteroides": {
+            "total": num_asteroides,
+            **_estatisticas_deriva(a0, e0, a, e, asteroide & ~ejetado),
+        },
+        "planetas": _estatisticas_deriva(a0, e0, a, e, ~asteroide & ~ejetado),
+        "desvio_energia": resumo["desvio_energia"],
+        "avaliacoes_por_ano": resumo["avaliacoes_por_ano"],
+        "tempo": time.perf_counter() - inicio,
+    }
+
+
+def _executar_protegido(parametros, anos, metodo, integrador):
+    """
+    Executa uma configuração sem deixar uma falha interromper o conjunto
+
+    Retorna:
+        dict: resultado da configuração ou a descrição do erro
+    """
+    try:
+        return executar_configuracao(parametros, anos, metodo, integrador)
+    except Exception as erro:
+        return {"parametros": parametros, "erro": repr(erro), "detalhes": traceback.format_exc()}
+
+
+def executar_conjunto(configuracoes, anos, saida, processos=None, metodo=METODO_GRAVIDADE, integrador=INTEGRADOR):
+    """
+    Executa várias configurações independentes em um pool de processos
+
+    Cada resultado é acrescentado ao arquivo de saída (uma linha JSON por configuração) assim que
+    a configuração termina, de forma que resultados parciais podem ser analisados durante a
+    execução e não se perdem se ela for interrompida.
+
+    Parâmetros:
+        configuracoes (list): parâmetros de cada execução (ver executar_configuracao)
+        anos (float): tempo simulado em anos de cada execução
+        saida (str): arquivo JSON Lines onde os resultados são acrescentados
+        processos (int): quantidade de processos do pool (None usa todos os núcleos)
+        metodo (str): método usado no cálculo da gravidade
+        integrador (str): integrador usado em cada passo
+
+    Retorna:
+        int: quantidade de configurações que falharam
+    """
+    falhas = 0
+    with open(saida, "a", encoding="utf-8") as arquivo, ProcessPoolExecutor(processos) as executor:
+        futuros = [
+            executor.submit(_executar_protegido, parametros, anos, metodo, integrador) for parametros in configuracoes
+        ]
+        for concluidas, futuro in enumerate(as_completed(futuros), 1):
+            resultado = futuro.result()
+            arquivo.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+            arquivo.flush()
+            if "erro" in resultado:
+                falhas += 1
+                print(f"[{concluidas}/{len(futuros)}] {resultado['parametros']}: falhou ({resultado['erro']})")
+            else:
+                print(
+                    f"[{concluidas}/{len(futuros)}] {resultado['parametros']}: "
+                    f"{resultado['asteroides_ejetados']}/{resultado['asteroides']['total']} asteroides ejetados, "
+                    f"ΔE/E {resultado['desvio_energia']:.1e} em {resultado['tempo']:.1f} s"
+                )
+    return falhas
+
+
+def configuracoes_concluidas(saida):
+    """
+    Lê os parâmetros das configurações que já têm resultado (sem erro) no arquivo de saída
+
+    Parâmetro:
+        saida (str): arquivo JSON Lines de uma execução anterior
+
+    Retorna:
+        set: parâmetros concluídos, serializados em JSON com as chaves ordenadas
+    """
+    concluidas = set()
+    if not os.path.exists(saida):
+        return concluidas
+    with open(saida, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            try:
+                resultado = json.loads(linha)
+            except json.JSONDecodeError:
+                # Linha incompleta de uma execução interrompida
+                continue
+            if "erro" not in resultado:
+                concluidas.add(json.dumps(resultado["parametros"], sort_keys=True))
+    return concluidas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Conjunto de simulações independentes sobre uma grade de parâmetros")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--raio-interno", type=float, nargs="+", default=[ASTEROID_BELT_INNER_RADIUS])
+    parser.add_argument("--raio-externo", type=float, nargs="+", default=[ASTEROID_BELT_OUTER_RADIUS])
+    parser.add_argument("--asteroides", type=int, nargs="+", default=[NUM_ASTEROIDS])
+    parser.add_argument("--escala-massas", type=float, nargs="+", default=[1.0], help="fator das massas dos planetas")
+    parser.add_argument("--dt", type=float, nargs="+", default=[timeStep])
+    parser.add_argument("--anos", type=float, default=1.0, help="tempo simulado em anos de cada execução")
+    parser.add_argument("--metodo", choices=["direto", "barnes-hut"], default=METODO_GRAVIDADE)
+    parser.add_argument("--integrador", choices=list(INTEGRADORES), default=INTEGRADOR)
+    parser.add_argument("--processos", type=int, default=None, help="processos do pool (padrão: todos os núcleos)")
+    parser.add_argument("--saida", default="ensemble.jsonl", help="arquivo JSON Lines com um resultado por linha")
+    parser.add_argument(
+        "--continuar", action="store_true", help="pula as configurações que já têm resultado no arquivo de saída"
+    )
+    args = parser.parse_args()
+
+    configuracoes = grade_parametros(
+        seed=args.seeds,
+        raio_interno=args.raio_interno,
+        raio_externo=args.raio_externo,
+        num_asteroides=args.asteroides,
+        escala_massas=args.escala_massas,
+        dt=args.dt,
+    )
+    if args.continuar:
+        concluidas = configuracoes_concluidas(args.saida)
+        configuracoes = [p for p in configuracoes if json.dumps(p, sort_keys=True) not in concluidas]
+    elif os.path.exists(args.saida):
+        parser.error(f"{args.saida} já existe; use --continuar para completá-lo ou escolha outro --saida")
+
+    print(f"{len(configuracoes)} configurações, {args.anos} ano(s) simulado(s) cada, resultados em {args.saida}")
+    inicio = time.perf_counter()
+    falhas = executar_conjunto(configuracoes, args.anos, args.saida, args.processos, args.metodo, args.integrador)
+    print(f"Concluído em {time.perf_counter() - inicio:.1f} s ({falhas} falha(s))")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+from functools import partial
+
+import numpy as np
+
+# Constante gravitacional utilizada na simulação
+G = 6.67430e-11
+
+# Quantidade máxima de pares (alvo, fonte) avaliados de uma só vez no kernel vetorizado.
+# Limita a memória temporária de cada bloco a poucas vezes TAMANHO_BLOCO * 8 bytes,
+# o suficiente para os vetores intermediários caberem na cache do processador
+TAMANHO_BLOCO = 1 << 14
+
+
+def aceleracoes_diretas(alvos, fontes, massa_fontes, saida=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Cálculo vetorizado das acelerações gravitacionais por soma direta (O(N²))
+
+    1. Divide os alvos em blocos, de forma que cada bloco tenha no máximo 'tamanho_bloco' pares
+    2. Para cada bloco, calcula os vetores entre cada alvo e todas as fontes
+    3. Calcula G * m / dist³ para cada par, ignorando pares com distância nula (o próprio corpo)
+    4. Soma as contribuições de todas as fontes, obtendo a aceleração de cada alvo
+
+    Equivale a somar a força de cada par dividida pela massa do alvo, sem criar objetos por par.
+
+    Parâmetros:
+        alvos (np.ndarray): posições (N, 2) dos corpos cuja aceleração será calculada
+        fontes (np.ndarray): posições (M, 2) dos corpos que exercem a força
+        massa_fontes (np.ndarray): massas (M,) dos corpos que exercem a força
+        saida (np.ndarray): vetor (N, 2) opcional onde o resultado será escrito
+        tamanho_bloco (int): número máximo de pares calculados por bloco
+
+    Retorna:
+        np.ndarray: acelerações (N, 2) dos alvos
+    """
+    n = len(alvos)
+    if saida is None:
+        saida = np.empty((n, 2))
+    if len(fontes) == 0:
+        saida[:] = 0.0
+        return saida
+
+    passo = max(1, tamanho_bloco // len(fontes))
+    gm = G * massa_fontes
+    for inicio in range(0, n, passo):
+        fim = min(n, inicio + passo)
+        # Vetores que partem de cada alvo em direção a cada fonte
+        dx = fontes[:, 0] - alvos[inicio:fim, 0, None]
+        dy = fontes[:, 1] - alvos[inicio:fim, 1, None]
+        dist2 = dx * dx
+        dist2 += dy * dy
+        dist3 = np.sqrt(dist2)
+        dist3 *= dist2
+        # Pares com distância nula (o próprio corpo) não exercem força
+        fator = np.divide(gm, dist3, out=np.zeros_like(dist3), where=dist3 != 0)
+        saida[inicio:fim, 0] = np.einsum("ij,ij->i", dx, fator)
+        saida[inicio:fim, 1] = np.einsum("ij,ij->i", dy, fator)
+    return saida
+
+
+def potenciais_diretos(alvos, fontes, massa_fontes, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Cálculo vetorizado do potencial gravitacional das fontes na posição de cada alvo
+
+    φ(alvo) = -Σ G * m_fonte / dist, ignorando pares com distância nula (o próprio corpo)
+
+    Usado apenas nos diagnósticos de energia; segue a mesma divisão em blocos de aceleracoes_diretas.
+
+    Parâmetros:
+        alvos (np.ndarray): posições (N, 2) onde o potencial é calculado
+        fontes (np.ndarray): posições (M, 2) dos corpos que geram o potencial
+        massa_fontes (np.ndarray): massas (M,) dos corpos que geram o potencial
+        tamanho_bloco (int): número máximo de pares calculados por bloco
+
+    Retorna:
+        np.ndarray: potenciais (N,) dos alvos
+    """
+    n = len(alvos)
+    saida = np.zeros(n)
+    if len(fontes) == 0:
+        return saida
+
+    passo = max(1, tamanho_bloco // len(fontes))
+    gm = G * massa_fontes
+    for inicio in range(0, n, passo):
+        fim = min(n, inicio + passo)
+        dx = fontes[:, 0] - alvos[inicio:fim, 0, None]
+        dy = fontes[:, 1] - alvos[inicio:fim, 1, None]
+        dist = np.hypot(dx, dy)
+        saida[inicio:fim] = -np.divide(gm, dist, out=np.zeros_like(dist), where=dist != 0).sum(axis=1)
+    return saida
+
+
+def elementos_orbitais(pos, vel, massa, pos_centro, vel_centro, massa_centro):
+    """
+    Semieixo maior e excentricidade das órbitas (no plano) em torno de um corpo central
+
+    Com μ = G(M + m), energia específica ε = v²/2 - μ/r e momento angular específico h:
+    a = -μ / 2ε e e = sqrt(1 + 2εh²/μ²). Órbitas não ligadas (ε ≥ 0) têm a = inf e e ≥ 1.
+
+    Parâmetros:
+        pos, vel (np.ndarray): posições e velocidades (N, 2) dos corpos
+        massa (np.ndarray): massas (N,) dos corpos
+        pos_centro, vel_centro (np.ndarray): posição e velocidade (2,) do corpo central
+        massa_centro (float): massa do corpo central
+
+    Retorna:
+        tuple: semieixos maiores (N,), excentricidades (N,) e energias específicas (N,)
+    """
+    r = pos - pos_centro
+    v = vel - vel_centro
+    mu = G * (massa_centro + massa)
+    dist = np.hypot(r[:, 0], r[:, 1])
+    energia = 0.5 * np.einsum("ij,ij->i", v, v) - mu / dist
+    h = r[:, 0] * v[:, 1] - r[:, 1] * v[:, 0]
+    with np.errstate(divide="ignore"):
+        semieixo = np.where(energia < 0, -mu / (2 * energia), np.inf)
+    excentricidade = np.sqrt(np.maximum(0.0, 1 + 2 * energia * h * h / (mu * mu)))
+    return semieixo, excentricidade, energia
+
+
+def calculador_gravidade(metodo="direto", theta=0.5, processos=1):
+    """
+    Escolhe a função usada no cálculo das acelerações
+
+    Todas as funções retornadas têm a assinatura (alvos, fontes, massa_fontes, saida=None).
+
+    Parâmetros:
+        metodo (str): "direto" para a soma exata ou "barnes-hut" para a aproximação por quadtree
+        theta (float): ângulo de abertura usado pelo Barnes–Hut
+        processos (int): quantidade de processos; acima de 1 o cálculo é dividido em um pool
+
+    Retorna:
+        callable: função que calcula as acelerações
+    """
+    if processos > 1:
+        from paralelo import CalculadorParalelo
+
+        return CalculadorParalelo(processos, metodo, theta)
+    if metodo == "direto":
+        return aceleracoes_diretas
+    if metodo == "barnes-hut":
+        from barnesHut import aceleracoes_barnes_hut
+
+        return partial(aceleracoes_barnes_hut, theta=theta)
+    raise ValueError(f"Método de gravidade desconhecido: {metodo}")
+
+
+class MotorFisico:
+    """
+    Motor de física que integra os corpos guardados em um BodySystem
+
+    As posições atuais, posições anteriores, velocidades e massas ficam em vetores contíguos do
+    NumPy, e cada passo é feito com operações em lote no próprio lugar, sem alocações por corpo.
+    O esquema de integração é escolhido pelo parâmetro 'integrador' (ver integradores.py).
+
+    Corpos marcados como partícula de teste sentem a gravidade dos demais, mas não exercem força.
+    Assim o custo de cada passo cai de O(N²) para O(N_massivos × N).
+
+    Atributos:
+        corpos (BodySystem): corpos integrados pelo motor
+        acel (np.ndarray): acelerações (N, 2) calculadas por último
+        acel_valida (bool): indica que acel corresponde às posições atuais de todos os corpos
+        avaliacoes (float): avaliações de força executadas, em múltiplos de uma avaliação de todos os corpos
+        metodo (str): método usado no cálculo da gravidade ("direto" ou "barnes-hut")
+        processos (int): quantidade de processos usados no cálculo da gravidade
+        integrador: esquema de integração, com o método passo(motor, dt)
+    """
+
+    def __init__(self, corpos, metodo="direto", theta=0.5, processos=1, integrador="verlet"):
+        from integradores import criar_integrador
+
+        self.corpos = corpos
+        self.metodo = metodo
+        self.processos = processos
+        self.integrador = criar_integrador(integrador) if isinstance(integrador, str) else integrador
+        self.avaliacoes = 0.0
+        self._calculador = calculador_gravidade(metodo, theta, processos)
+        # Com o cálculo em paralelo, os vetores dos corpos e as acelerações ficam em memória compartilhada
+        self._alocar = getattr(self._calculador, "alocar", np.zeros)
+        self._liberar = getattr(self._calculador, "liberar", None)
+        if self._alocar is not np.zeros:
+            corpos.usar_alocador(self._alocar, self._liberar)
+        self._reserva_acel = None
+        self._versao = None
+        self._preparar()
+
+    def _preparar(self):
+        """
+        Recria os vetores auxiliares e a lista de fontes quando corpos são adicionados ou removidos
+        """
+        n = len(self.corpos)
+        # As acelerações têm folga de capacidade, como os vetores dos corpos, para não serem
+        # realocadas (em memória compartilhada, no cálculo em paralelo) a cada corpo adicionado
+        reserva = self._reserva_acel
+        if reserva is None or len(reserva) < n:
+            capacidade = n if reserva is None else max(n, 2 * len(reserva))
+            self._reserva_acel = self._alocar((capacidade, 2), np.float64)
+            if reserva is not None and self._liberar is not None:
+                self._liberar(reserva)
+        self.acel = self._reserva_acel[:n]
+        self.acel_valida = False
+        # Vetor auxiliar reaproveitado a cada passo
+        self._aux = np.zeros((n, 2))
+        particulaTeste = self.corpos.particulaTeste
+        self._fontes = np.flatnonzero(~particulaTeste) if particulaTeste.any() else None
+        self._versao = self.corpos.versao
+
+    def __len__(self):
+        return len(self.corpos)
+
+    @property
+    def pos(self):
+        return self.corpos.pos
+
+    @property
+    def antPos(self):
+        return self.corpos.antPos
+
+    @property
+    def vel(self):
+        return self.corpos.vel
+
+    @property
+    def massa(self):
+        return self.corpos.massa
+
+    @property
+    def aux(self):
+        """np.ndarray: vetor auxiliar (N, 2) que os integradores podem usar livremente"""
+        if self._versao != self.corpos.versao:
+            self._preparar()
+        return self._aux
+
+    def fontes(self):
+        """
+        Posições e massas dos corpos que exercem força (todos, exceto as partículas de teste)
+
+        Retorna:
+            tuple: posições (M, 2) e massas (M,) das fontes
+        """
+        if self._versao != self.corpos.versao:
+            self._preparar()
+        pos, massa = self.corpos.pos, self.corpos.massa
+        if self._fontes is None:
+            return pos, massa
+        return pos[self._fontes], massa[self._fontes]
+
+    def aceleracoes(self, indices=None):
+        """
+        Calcula a aceleração gravitacional de todos os corpos ou apenas de alguns
+
+        Apenas os corpos que não são partículas de teste entram como fontes da força.
+
+        Parâmetro:
+            indices (np.ndarray): índices dos corpos cuja aceleração é recalculada (None para todos)
+
+        Retorna:
+            np.ndarray: acelerações (N, 2), escritas em self.acel
+        """
+        fontes, massa_fontes = self.fontes()
+        if indices is None:
+            self._calculador(self.corpos.pos, fontes, massa_fontes, saida=self.acel)
+            self.acel_valida = True
+            self.avaliacoes += 1
+        else:
+            self.acel[indices] = self._calculador(self.corpos.pos[indices], fontes, massa_fontes)
+            self.acel_valida = False
+            self.avaliacoes += len(indices) / max(len(self.corpos), 1)
+        return self.acel
+
+    def passo(self, dt):
+        """
+        Avança a simulação em um passo de tamanho dt com o integrador escolhido
+
+        Parâmetro:
+            dt (float): intervalo de tempo do passo
+        """
+        self.integrador.passo(self, dt)
+
+    def fechar(self):
+        """
+        Libera os recursos do cálculo em paralelo (processos e memória compartilhada), se houver
+        """
+        fechar = getattr(self._calculador, "fechar", None)
+        if fechar is not None:
+            fechar()
@@ -0,0 +1,197 @@
+import numpy as np
+
+# Limite de células por eixo: com até 255 x 255 células (mais uma para os corpos fora da grade) o
+# índice de cada célula cabe em 16 bits e a ordenação estável do NumPy passa a ser um radix sort, O(N)
+CELULAS_MAXIMAS_POR_EIXO = 255
+
+# Quantidade média desejada de corpos por célula
+CORPOS_POR_CELULA = 4
+
+# A extensão da grade é estimada por percentis de uma amostra de até AMOSTRA_EXTENSAO corpos,
+# ampliados por MARGEM_EXTENSAO vezes o intervalo entre eles de cada lado
+AMOSTRA_EXTENSAO = 4096
+PERCENTIS_EXTENSAO = (1, 99)
+MARGEM_EXTENSAO = 0.25
+
+
+def _extensao(coordenadas):
+    """
+    Estima o intervalo de uma coordenada que contém a maior parte dos corpos
+
+    Os percentis de uma amostra dos corpos, ampliados por uma margem, ignoram corpos isolados
+    muito distantes. Se todos os corpos couberem nesse intervalo, ele é reduzido ao mínimo e ao
+    máximo das coordenadas.
+
+    Parâmetro:
+        coordenadas (np.ndarray): coordenada (N,) de cada corpo
+
+    Retorna:
+        tuple: início e fim do intervalo e se algum corpo ficou fora dele
+    """
+    menor, maior = coordenadas.min(), coordenadas.max()
+    amostra = coordenadas[:: max(1, len(coordenadas) // AMOSTRA_EXTENSAO)]
+    # Seleção parcial dos dois percentis: bem mais rápida que np.percentile em amostras pequenas
+    posicoes = [(len(amostra) - 1) * p // 100 for p in PERCENTIS_EXTENSAO]
+    inferior, superior = np.partition(amostra, posicoes)[posicoes]
+    margem = MARGEM_EXTENSAO * (superior - inferior)
+    inicio, fim = max(menor, inferior - margem), min(maior, superior + margem)
+    return inicio, fim, inicio > menor or fim < maior
+
+
+class IndiceEspacial:
+    """
+    Grade uniforme para encontrar rapidamente os corpos perto de um ponto ou dentro de um retângulo
+
+    Os corpos são ordenados pela célula da grade em que estão, e o início de cada célula nessa
+    ordem é guardado, de forma que os corpos de uma linha de células formam um único intervalo
+    contíguo. Uma consulta só percorre as células que tocam a região procurada, com custo
+    proporcional a elas e aos corpos encontrados, e não à quantidade total de corpos.
+
+    Corpos com raio maior que uma célula (como o Sol) não entram na grade: ficam em uma lista à
+    parte, testada diretamente em toda consulta. A grade cobre apenas a região onde está a maior
+    parte dos corpos (percentis das posições, com uma margem), e corpos distantes, como um
+    asteroide ejetado, vão para a mesma lista; caso contrário um único corpo distante
+    espremeria todos os demais em poucas células.
+
+    A grade é reconstruída inteira a cada atualização das posições (uma ordenação O(N)).
+
+    Atributos:
+        pos (np.ndarray): posições (N, 2) indexadas
+        raio (np.ndarray): raios (N,) dos corpos
+        tamanho_celula (float): lado de cada célula
+        grandes (np.ndarray): índices dos corpos mantidos fora da grade (grandes ou distantes)
+    """
+
+    def __init__(self, pos, raio, corpos_por_celula=CORPOS_POR_CELULA):
+        """
+        Parâmetros:
+            pos (np.ndarray): posições (N, 2) dos corpos
+            raio (np.ndarray): raios (N,) dos corpos
+            corpos_por_celula (float): quantidade média desejada de corpos por célula
+        """
+        self.pos = pos
+        self.raio = raio
+        n = len(pos)
+
+        distante = None
+        if n:
+            # Reduções por coluna são bem mais rápidas que pos.min(axis=0) em um vetor (N, 2)
+            x, y = pos[:, 0], pos[:, 1]
+            (x0, x1, cortado_x), (y0, y1, cortado_y) = _extensao(x), _extensao(y)
+            minimo = np.array([x0, y0])
+            lado = max(x1 - x0, y1 - y0)
+            if cortado_x or cortado_y:
+                distante = (x < x0) | (x > x0 + lado) | (y < y0) | (y > y0 + lado)
+        else:
+            minimo, lado = np.zeros(2), 0.0
+        celulas = int(np.clip(np.ceil(np.sqrt(n / corpos_por_celula)), 1, CELULAS_MAXIMAS_POR_EIXO))
+        self.tamanho_celula = (lado / celulas if lado > 0 else 1.0) * (1 + 1e-9)
+        self._minimo = minimo
+        self._celulas = celulas
+
+        grande = raio > self.tamanho_celula
+        if distante is not None:
+            grande |= distante
+        self.grandes = np.flatnonzero(grande)
+        # Maior raio entre os corpos da grade: margem usada nas consultas
+        self._raio_maximo = float(raio[~grande].max()) if len(self.grandes) < n else 0.0
+
+        # Os corpos grandes e distantes vão para uma célula extra, depois de todas as células da grade
+        cx, cy = self._celula(pos)
+        celula = cy * celulas
+        celula += cx
+        celula[grande] = celulas * celulas
+        celula = celula.astype(np.uint16)
+        self._ordem = np.argsort(celula, kind="stable")
+        # Corpos da célula c: self._ordem[self._inicio[c]:self._inicio[c + 1]]
+        self._inicio = np.zeros(celulas * celulas + 2, dtype=np.int64)
+        np.cumsum(np.bincount(celula, minlength=celulas * celulas + 1), out=self._inicio[1:])
+        self._pequenos = self._ordem[: self._inicio[-2]]
+
+    def _celula(self, pos):
+        """
+        Calcula a coluna e a linha da grade de cada posição, limitadas às células existentes
+
+        Parâmetro:
+            pos (np.ndarray): posições (K, 2)
+
+        Retorna:
+            tuple: colunas e linhas (K,) das células
+        """
+        colunas = []
+        for eixo in range(2):
+            c = pos[:, eixo] - self._minimo[eixo]
+            c /= self.tamanho_celula
+            c = c.astype(np.int64)
+            np.clip(c, 0, self._celulas - 1, out=c)
+            colunas.append(c)
+        return colunas
+
+    def no_retangulo(self, xmin, ymin, xmax, ymax):
+        """
+        Encontra os corpos que tocam um retângulo (por exemplo, a área visível da tela)
+
+        Parâmetros:
+            xmin, ymin, xmax, ymax (float): limites do retângulo em espaço de simulação
+
+        Retorna:
+            np.ndarray: índices dos corpos cujo círculo toca o retângulo
+        """
+        margem = self._raio_maximo
+        cantos = np.array([[xmin - margem, ymin - margem], [xmax + margem, ymax + margem]])
+        (cx0, cx1), (cy0, cy1) = self._celula(cantos)
+        fora = (
+            xmax + margem < self._minimo[0]
+            or ymax + margem < self._minimo[1]
+            or xmin - margem > self._minimo[0] + self._celulas * self.tamanho_celula
+            or ymin - margem > self._minimo[1] + self._celulas * self.tamanho_celula
+        )
+
+        if fora:
+            candidatos = self.grandes
+        elif cx0 == 0 and cy0 == 0 and cx1 == cy1 == self._celulas - 1:
+            # O retângulo cobre a grade inteira
+            candidatos = np.concatenate([self._pequenos, self.grandes])
+        else:
+            # Cada linha de células do retângulo é um único intervalo na ordem da grade
+            inicio = self._inicio
+            linhas = [
+                self._ordem[inicio[cy * self._celulas + cx0] : inicio[cy * self._celulas + cx1 + 1]]
+                for cy in range(cy0, cy1 + 1)
+            ]
+            candidatos = np.concatenate(linhas + [self.grandes])
+
+        pos, raio = self.pos[candidatos], self.raio[candidatos]
+        dentro = (
+            (pos[:, 0] + raio >= xmin)
+            & (pos[:, 0] - raio <= xmax)
+            & (pos[:, 1] + raio >= ymin)
+            & (pos[:, 1] - raio <= ymax)
+        )
+        return candidatos[dentro]
+
+    def no_ponto(self, x, y, raio_minimo=0.0):
+        """
+        Encontra o corpo sob um ponto (por exemplo, o cursor do mouse)
+
+        Um corpo é atingido se a distância do ponto ao seu centro for menor que o seu raio ou que
+        'raio_minimo' (usado para que corpos muito pequenos na tela continuem selecionáveis).
+        Entre os corpos atingidos, vence o de centro mais próximo.
+
+        Parâmetros:
+            x, y (float): ponto em espaço de simulação
+            raio_minimo (float): raio mínimo de seleção em espaço de simulação
+
+        Retorna:
+            int: índice do corpo sob o ponto, ou -1 se nenhum for atingido
+        """
+        alcance = max(raio_minimo, 0.0)
+        candidatos = self.no_retangulo(x - alcance, y - alcance, x + alcance, y + alcance)
+        if not len(candidatos):
+            return -1
+        dist2 = np.sum((self.pos[candidatos] - (x, y)) ** 2, axis=1)
+        limite = np.maximum(self.raio[candidatos], raio_minimo)
+        atingidos = dist2 < limite * limite
+        if not atingidos.any():
+            return -1
+        return int(candidatos[atingidos][np.argmin(dist2[atingidos])])
@@ -0,0 +1,398 @@
+import argparse
+import time
+
+import numpy as np
+
+from fisica import potenciais_diretos
+
+# Coeficientes do integrador simplético de 4ª ordem de Yoshida (1990)
+_W1 = 1 / (2 - 2 ** (1 / 3))
+_W0 = -(2 ** (1 / 3)) * _W1
+# Frações do passo usadas em cada deriva (c) e em cada impulso (d)
+_C_YOSHIDA = (_W1 / 2, (_W0 + _W1) / 2, (_W0 + _W1) / 2, _W1 / 2)
+_D_YOSHIDA = (_W1, _W0, _W1)
+
+
+def _acel_inicial(motor):
+    """
+    Retorna as acelerações das posições atuais, reaproveitando as do fim do passo anterior se ainda valerem
+    """
+    # Corpos adicionados ou removidos invalidam as acelerações guardadas (e mudam o tamanho dos vetores)
+    if motor._versao != motor.corpos.versao:
+        motor._preparar()
+    return motor.acel if motor.acel_valida else motor.aceleracoes()
+
+
+class Verlet:
+    """
+    Método de Integração de Verlet (posição), o esquema original da simulação
+
+    r(t + dt) = 2r(t) - r(t - dt) + a(t)dt²
+
+    Usa a posição anterior em vez da velocidade; a velocidade é estimada depois de cada passo como
+    (r(t + dt) - r(t)) / dt + a(t)dt / 2, com erro O(dt²). Uma avaliação de força por passo.
+    """
+
+    nome = "verlet"
+
+    def passo(self, motor, dt):
+        acel = _acel_inicial(motor)
+        pos, antPos, vel = motor.pos, motor.antPos, motor.vel
+        aux = motor.aux
+        # aux guarda r(t) para virar a nova posição anterior
+        aux[:] = pos
+        pos *= 2
+        pos -= antPos
+        antPos[:] = aux
+        np.multiply(acel, dt * dt, out=aux)
+        pos += aux
+        motor.acel_valida = False
+        # v(t + dt) ≈ (r(t + dt) - r(t)) / dt + a(t)dt / 2
+        np.subtract(pos, antPos, out=vel)
+        vel /= dt
+        aux *= 0.5 / dt
+        vel += aux
+
+
+class Leapfrog:
+    """
+    Velocity Verlet (leapfrog no esquema impulso-deriva-impulso)
+
+    v(t + dt/2) = v(t) + a(t)dt/2
+    r(t + dt) = r(t) + v(t + dt/2)dt
+    v(t + dt) = v(t + dt/2) + a(t + dt)dt/2
+
+    Simplético e de 2ª ordem, com posição e velocidade sincronizadas ao fim de cada passo. As
+    acelerações do fim de um passo são reaproveitadas no início do próximo, de forma que cada
+    passo custa uma avaliação de força.
+    """
+
+    nome = "leapfrog"
+
+    def passo(self, motor, dt):
+        acel = _acel_inicial(motor)
+        pos, antPos, vel = motor.pos, motor.antPos, motor.vel
+        aux = motor.aux
+        antPos[:] = pos
+        np.multiply(acel, dt / 2, out=aux)
+        vel += aux
+        np.multiply(vel, dt, out=aux)
+        pos += aux
+        motor.acel_valida = False
+        acel = motor.aceleracoes()
+        np.multiply(acel, dt / 2, out=aux)
+        vel += aux
+
+
+class Yoshida4:
+    """
+    Integrador simplético de 4ª ordem de Yoshida
+
+    Composição de três passos de leapfrog com frações w1, w0, w1 do passo (w0 negativo), na forma
+    de quatro derivas e três impulsos. Custa três avaliações de força por passo, mas o erro cai
+    com dt⁴, permitindo passos bem maiores para a mesma precisão.
+    """
+
+    nome = "yoshida4"
+
+    def passo(self, motor, dt):
+        pos, antPos, vel = motor.pos, motor.antPos, motor.vel
+        aux = motor.aux
+        antPos[:] = pos
+        for i, c in enumerate(_C_YOSHIDA):
+            np.multiply(vel, c * dt, out=aux)
+            pos += aux
+            motor.acel_valida = False
+            if i < len(_D_YOSHIDA):
+                acel = motor.aceleracoes()
+                np.multiply(acel, _D_YOSHIDA[i] * dt, out=aux)
+                vel += aux
+
+
+def _distancia_dominante(motor):
+    """
+    Calcula a distância de cada corpo à fonte de maior massa (para ela própria, à segunda maior)
+
+    Retorna:
+        np.ndarray: distâncias (N,); infinitas se não houver outra fonte
+    """
+    pos = motor.pos
+    pos_fontes, massa_fontes = motor.fontes()
+    if not len(massa_fontes):
+        return np.full(len(pos), np.inf)
+    ordem = np.argsort(massa_fontes)[::-1]
+    d = np.hypot(*(pos - pos_fontes[ordem[0]]).T)
+    proprio = d == 0
+    if proprio.any():
+        d[proprio] = np.hypot(*(pos[proprio] - pos_fontes[ordem[1]]).T) if len(ordem) > 1 else np.inf
+    return d
+
+
+class PassosAdaptativos:
+    """
+    Leapfrog com passos individuais em blocos (potências de 2 do passo base)
+
+    No início de cada passo base dt, cada corpo recebe um nível k, com passo dt / 2^k, escolhido
+    pelo critério dt_i = eta * sqrt(d_i / |a_i|), em que d_i é a distância à fonte de maior massa
+    (para ela própria, à segunda maior). Em uma órbita circular essa escala é igual a |v_i| / |a_i|
+    (uma fração da escala de tempo orbital do corpo), mas, por depender apenas da aceleração,
+    continua finita para corpos parados, como o Sol no início da simulação. Corpos internos ou em
+    encontros próximos recebem passos menores, e Netuno e o cinturão externo, passos maiores.
+
+    O passo base é dividido em 2^kmax subpassos. A cada subpasso todos os corpos derivam, mas só
+    recebem impulso (e avaliação de força) os corpos cujo passo começa ou termina nele. O esquema
+    continua simétrico (impulso-deriva-impulso por corpo), e as forças são calculadas com as
+    posições de todas as fontes no mesmo instante.
+
+    Atributos:
+        eta (float): fração da escala de tempo usada como passo de cada corpo
+        niveis (int): quantidade máxima de subdivisões do passo base (passo mínimo dt / 2^niveis)
+        niveis_ultimo_passo (np.ndarray): nível de cada corpo no último passo
+    """
+
+    nome = "adaptativo"
+
+    def __init__(self, eta=0.01, niveis=8):
+        self.eta = eta
+        self.niveis = niveis
+        self.niveis_ultimo_passo = None
+
+    def niveis_corpos(self, motor, dt):
+        """
+        Escolhe o nível de passo de cada corpo
+
+        Parâmetros:
+            motor (MotorFisico): motor com velocidades e acelerações atuais
+            dt (float): passo base
+
+        Retorna:
+            np.ndarray: nível (N,) de cada corpo, entre 0 e self.niveis
+        """
+        a = np.hypot(motor.acel[:, 0], motor.acel[:, 1])
+        d = _distancia_dominante(motor)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            razao = np.sqrt(a / d)
+        razao *= dt / self.eta
+        # Corpos sem aceleração ficam no nível 0; sobre a própria fonte dominante, no menor passo
+        razao[np.isnan(razao)] = 1.0
+        k = np.ceil(np.log2(np.maximum(razao, 1.0)))
+        return np.minimum(k, self.niveis).astype(np.int64)
+
+    def passo(self, motor, dt):
+        acel = _acel_inicial(motor)
+        pos, antPos, vel = motor.pos, motor.antPos, motor.vel
+        antPos[:] = pos
+
+        k = self.niveis_corpos(motor, dt)
+        self.niveis_ultimo_passo = k
+        kmax = int(k.max()) if len(k) else 0
+        subpassos = 1 << kmax
+        h = dt / subpassos
+        # Corpos de cada nível e metade do passo de cada nível
+        por_nivel = [np.flatnonzero(k == nivel) for nivel in range(kmax + 1)]
+        meio_passo = [dt / (1 << nivel) / 2 for nivel in range(kmax + 1)]
+
+        for s in range(subpassos):
+            # Níveis com passo começando neste subpasso: s múltiplo de 2^(kmax - nivel)
+            for nivel in range(kmax + 1):
+                if s % (1 << (kmax - nivel)) == 0 and len(por_nivel[nivel]):
+                    indices = por_nivel[nivel]
+                    vel[indices] += acel[indices] * meio_passo[nivel]
+
+            pos += vel * h
+            motor.acel_valida = False
+
+            # Níveis com passo terminando ao fim deste subpasso
+            terminam = [nivel for nivel in range(kmax + 1) if (s + 1) % (1 << (kmax - nivel)) == 0]
+            if len(terminam) == kmax + 1:
+                motor.aceleracoes()
+            else:
+                indices = np.concatenate([por_nivel[nivel] for nivel in terminam])
+                if len(indices):
+                    motor.aceleracoes(indices)
+            for nivel in terminam:
+                indices = por_nivel[nivel]
+                vel[indices] += acel[indices] * meio_passo[nivel]
+
+
+INTEGRADORES = {
+    Verlet.nome: Verlet,
+    Leapfrog.nome: Leapfrog,
+    Yoshida4.nome: Yoshida4,
+    PassosAdaptativos.nome: PassosAdaptativos,
+}
+
+
+def criar_integrador(nome="verlet", **opcoes):
+    """
+    Cria um integrador pelo nome
+
+    Parâmetros:
+        nome (str): "verlet", "leapfrog", "yoshida4" ou "adaptativo"
+        **opcoes: parâmetros do integrador (por exemplo, eta e niveis do adaptativo)
+
+    Retorna:
+        object: integrador com o método passo(motor, dt)
+    """
+    if nome not in INTEGRADORES:
+        raise ValueError(f"Integrador desconhecido: {nome}")
+    return INTEGRADORES[nome](**opcoes)
+
+
+def energia_total(motor):
+    """
+    Energia total do sistema: cinética de todos os corpos mais a potencial
+
+    A energia potencial conta cada par de fontes uma única vez e a interação de cada partícula de
+    teste com as fontes (as partículas de teste não interagem entre si).
+
+    Parâmetro:
+        motor (MotorFisico): motor com posições e velocidades sincronizadas
+
+    Retorna:
+        float: energia total
+    """
+    corpos = motor.corpos
+    massa, vel = corpos.massa, corpos.vel
+    cinetica = 0.5 * float(np.sum(massa * np.einsum("ij,ij->i", vel, vel)))
+    fontes, massa_fontes = motor.fontes()
+    potencial = massa * potenciais_diretos(corpos.pos, fontes, massa_fontes)
+    fonte = ~corpos.particulaTeste
+    return cinetica + 0.5 * float(potencial[fonte].sum()) + float(potencial[~fonte].sum())
+
+
+def momento_angular(motor):
+    """
+    Momento angular total em relação à origem, L = Σ m (x vy - y vx)
+
+    Parâmetro:
+        motor (MotorFisico): motor com posições e velocidades sincronizadas
+
+    Retorna:
+        float: momento angular total
+    """
+    pos, vel, massa = motor.pos, motor.vel, motor.massa
+    return float(np.sum(massa * (pos[:, 0] * vel[:, 1] - pos[:, 1] * vel[:, 0])))
+
+
+class Diagnostico:
+    """
+    Instrumentação de uma execução: desvios de energia e de momento angular e custo em forças
+
+    A cada registro, compara a energia e o momento angular com os valores iniciais. O custo é
+    medido em avaliações de força (de todos os corpos) por ano simulado, e o tempo de processador
+    é acumulado entre o primeiro e o último registro, permitindo comparar a precisão obtida por
+    segundo de processador de cada integrador.
+
+    Atributos:
+        historico (list): tuplas (tempo, desvio relativo de energia, desvio relativo de momento angular)
+        maior_desvio_energia, maior_desvio_momento (float): maiores desvios relativos registrados
+    """
+
+    def __init__(self, motor, ano):
+        """
+        Parâmetros:
+            motor (MotorFisico): motor observado, no estado inicial
+            ano (float): duração de um ano em unidades de tempo da simulação
+        """
+        self.motor = motor
+        self.ano = ano
+        self.energia_inicial = energia_total(motor)
+        self.momento_inicial = momento_angular(motor)
+        self.avaliacoes_iniciais = motor.avaliacoes
+        self.historico = []
+        self.maior_desvio_energia = 0.0
+        self.maior_desvio_momento = 0.0
+        self._cpu_inicial = time.process_time()
+        self._tempo_inicial = None
+
+    def registrar(self, tempo):
+        """
+        Mede energia e momento angular no estado atual
+
+        Parâmetro:
+            tempo (float): tempo simulado do estado atual
+        """
+        if self._tempo_inicial is None:
+            self._tempo_inicial = tempo
+        desvio_energia = abs((energia_total(self.motor) - self.energia_inicial) / self.energia_inicial)
+        desvio_momento = abs((momento_angular(self.motor) - self.momento_inicial) / self.momento_inicial)
+        self.maior_desvio_energia = max(self.maior_desvio_energia, desvio_energia)
+        self.maior_desvio_momento = max(self.maior_desvio_momento, desvio_momento)
+        self.historico.append((tempo, desvio_energia, desvio_momento))
+
+    def resumo(self):
+        """
+        Resumo da execução até o último registro
+
+        Retorna:
+            dict: desvios final e máximo de energia e de momento angular, avaliações de força,
+                avaliações por ano simulado e tempo de processador
+        """
+        tempo, desvio_energia, desvio_momento = self.historico[-1] if self.historico else (0.0, 0.0, 0.0)
+        anos = (tempo - (self._tempo_inicial or 0.0)) / self.ano
+        avaliacoes = self.motor.avaliacoes - self.avaliacoes_iniciais
+        return {
+            "anos": anos,
+            "desvio_energia": desvio_energia,
+            "maior_desvio_energia": self.maior_desvio_energia,
+            "desvio_momento": desvio_momento,
+            "maior_desvio_momento": self.maior_desvio_momento,
+            "avaliacoes": avaliacoes,
+            "avaliacoes_por_ano": avaliacoes / anos if anos > 0 else float("nan"),
+            "cpu": time.process_time() - self._cpu_inicial,
+        }
+
+
+def comparar(integradores, anos, dt, num_asteroides=0, seed=0, registros=100):
+    """
+    Integra as mesmas condições iniciais com vários integradores e mede a precisão de cada um
+
+    Parâmetros:
+        integradores (list): nomes dos integradores comparados
+        anos (float): tempo simulado em anos
+        dt (float): passo (passo base, no integrador adaptativo)
+        num_asteroides (int): quantidade de asteroides
+        seed (int): semente dos asteroides
+        registros (int): quantidade de medições ao longo da execução
+
+    Retorna:
+        list: um resumo de Diagnostico por integrador, com o nome do integrador
+    """
+    from condicoesIniciais import ANO_SIMULADO, criar_corpos
+    from fisica import MotorFisico
+
+    passos = max(1, int(round(anos * ANO_SIMULADO / dt)))
+    intervalo = max(1, passos // registros)
+    resultados = []
+    for nome in integradores:
+        corpos = criar_corpos(num_asteroides, seed=seed, dt=dt)
+        motor = MotorFisico(corpos, integrador=nome)
+        diagnostico = Diagnostico(motor, ANO_SIMULADO)
+        diagnostico.registrar(0.0)
+        for passo in range(1, passos + 1):
+            motor.passo(dt)
+            if passo % intervalo == 0 or passo == passos:
+                diagnostico.registrar(passo * dt)
+        resultados.append({"integrador": nome, **diagnostico.resumo()})
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara a precisão e o custo dos integradores")
+    parser.add_argument("--integradores", nargs="+", default=list(INTEGRADORES), choices=list(INTEGRADORES))
+    parser.add_argument("--anos", type=float, default=1.0, help="tempo simulado em anos")
+    parser.add_argument("--dt", type=float, default=100.0, help="passo (passo base do adaptativo)")
+    parser.add_argument("--asteroides", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'integrador':>10} {'ΔE/E final':>11} {'ΔE/E máx':>10} {'ΔL/L máx':>10} {'forças/ano':>11} {'cpu (s)':>8}")
+    for r in comparar(args.integradores, args.anos, args.dt, args.asteroides):
+        print(
+            f"{r['integrador']:>10} {r['desvio_energia']:>11.3e} {r['maior_desvio_energia']:>10.3e} "
+            f"{r['maior_desvio_momento']:>10.3e} {r['avaliacoes_por_ano']:>11.1f} {r['cpu']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
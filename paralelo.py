@@ -0,0 +1,255 @@
+import multiprocessing
+import os
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from fisica import calculador_gravidade
+
+# Memórias compartilhadas já abertas por cada processo trabalhador (nome -> SharedMemory)
+_anexadas = {}
+
+
+def _anexar(descricao):
+    """
+    Abre (uma única vez por processo) um vetor guardado em memória compartilhada
+
+    Parâmetro:
+        descricao (tuple): nome da memória compartilhada, formato e tipo do vetor
+
+    Retorna:
+        np.ndarray: vetor que usa diretamente a memória compartilhada
+    """
+    nome, formato, tipo = descricao
+    memoria = _anexadas.get(nome)
+    if memoria is None:
+        memoria = shared_memory.SharedMemory(name=nome)
+        _anexadas[nome] = memoria
+    return np.ndarray(formato, dtype=tipo, buffer=memoria.buf)
+
+
+def _fechar_liberadas(nomes):
+    """
+    Fecha, no processo trabalhador, as memórias compartilhadas que o processo principal já liberou
+
+    Parâmetro:
+        nomes (tuple): nomes das memórias compartilhadas liberadas
+    """
+    for nome in nomes:
+        memoria = _anexadas.pop(nome, None)
+        if memoria is not None:
+            memoria.close()
+
+
+def _calcular_bloco(tarefa):
+    """
+    Calcula, em um processo trabalhador, as acelerações de um bloco de alvos
+
+    O resultado é escrito diretamente no vetor de saída compartilhado.
+
+    Parâmetro:
+        tarefa (tuple): descrições dos vetores (alvos, fontes, massas, saída), intervalo de alvos,
+            método, theta e nomes das memórias compartilhadas já liberadas
+    """
+    alvos, fontes, massa, saida, inicio, fim, metodo, theta, liberadas = tarefa
+    _fechar_liberadas(liberadas)
+    alvos = _anexar(alvos)
+    saida = _anexar(saida)
+    calculador_gravidade(metodo, theta)(
+        alvos[inicio:fim], _anexar(fontes), _anexar(massa), saida=saida[inicio:fim]
+    )
+
+
+class CalculadorParalelo:
+    """
+    Cálculo das acelerações dividido entre vários processos
+
+    Os alvos são divididos em blocos, e cada processo de um pool persistente calcula as acelerações
+    de um bloco. Posições, massas e acelerações ficam em memória compartilhada
+    (multiprocessing.shared_memory): vetores criados com 'alocar' são lidos e escritos pelos
+    trabalhadores sem nenhuma cópia a cada passo. Vetores substituídos (por exemplo, ao crescer)
+    devem ser devolvidos com 'liberar'.
+
+    Tem a mesma assinatura de aceleracoes_diretas, podendo substituí-la no motor de física.
+    """
+
+    def __init__(self, processos=None, metodo="direto", theta=0.5, blocos_por_processo=2):
+        """
+        Parâmetros:
+            processos (int): quantidade de processos trabalhadores (None usa todos os núcleos)
+            metodo (str): método usado por cada trabalhador ("direto" ou "barnes-hut")
+            theta (float): ângulo de abertura do Barnes–Hut
+            blocos_por_processo (int): blocos de alvos por processo (melhora o balanceamento)
+        """
+        self.processos = processos or os.cpu_count()
+        self.metodo = metodo
+        self.theta = theta
+        self.blocos_por_processo = blocos_por_processo
+        self._memorias = []
+        # Vetores compartilhados conhecidos: endereço -> (vetor, descrição)
+        self._vetores = {}
+        # Vetores compartilhados temporários, usados para argumentos que não vieram de 'alocar',
+        # com folga de capacidade: chave -> vetor
+        self._temporarios = {}
+        # Memórias liberadas que os trabalhadores ainda podem ter abertas. Como os vetores crescem
+        # geometricamente, a lista cresce apenas com o logaritmo da maior quantidade de corpos
+        self._liberadas = []
+        # Memórias liberadas que ainda não puderam ser fechadas por ter vetores em uso
+        self._pendentes = []
+        # O rastreador de recursos é iniciado antes do pool para ser compartilhado com os
+        # trabalhadores; caso contrário cada um cria o seu e apaga a memória ao terminar
+        resource_tracker.ensure_running()
+        self._pool = multiprocessing.Pool(self.processos)
+
+    def alocar(self, formato, tipo=np.float64):
+        """
+        Cria um vetor de zeros em memória compartilhada com os trabalhadores
+
+        Parâmetros:
+            formato (tuple): formato do vetor
+            tipo (np.dtype): tipo dos elementos
+
+        Retorna:
+            np.ndarray: vetor que usa diretamente a memória compartilhada
+        """
+        tipo = np.dtype(tipo)
+        tamanho = max(1, int(np.prod(formato)) * tipo.itemsize)
+        memoria = shared_memory.SharedMemory(create=True, size=tamanho)
+        self._memorias.append(memoria)
+        vetor = np.ndarray(formato, dtype=tipo, buffer=memoria.buf)
+        vetor[...] = 0
+        self._vetores[vetor.ctypes.data] = (vetor, (memoria.name, vetor.shape, tipo.str))
+        return vetor
+
+    def liberar(self, vetor):
+        """
+        Libera a memória compartilhada de um vetor criado com 'alocar' que não será mais usado
+
+        Vetores desconhecidos (por exemplo, criados com np.zeros) são ignorados.
+
+        Parâmetro:
+            vetor (np.ndarray): vetor devolvido por 'alocar'
+        """
+        conhecido = self._vetores.get(vetor.ctypes.data)
+        if conhecido is None or conhecido[0] is not vetor:
+            return
+        del self._vetores[vetor.ctypes.data]
+        nome = conhecido[1][0]
+        memoria = next(m for m in self._memorias if m.name == nome)
+        self._memorias.remove(memoria)
+        memoria.unlink()
+        self._liberadas.append(nome)
+        self._pendentes.append(memoria)
+        self._fechar_pendentes()
+
+    def _fechar_pendentes(self):
+        """
+        Fecha as memórias liberadas que não têm mais vetores em uso
+        """
+        pendentes = []
+        for memoria in self._pendentes:
+            try:
+                memoria.close()
+            except BufferError:
+                # Ainda existem vetores usando a memória; nova tentativa na próxima liberação
+                pendentes.append(memoria)
+        self._pendentes = pendentes
+
+    def _descricao(self, vetor, chave, copiar=True):
+        """
+        Descreve um vetor para os trabalhadores, usando um vetor compartilhado temporário se preciso
+
+        Cada argumento tem um único vetor temporário, com folga de capacidade: ele só é trocado
+        (crescendo geometricamente) quando o argumento não cabe mais, e os trabalhadores recebem
+        apenas a parte com os dados.
+
+        Parâmetros:
+            vetor (np.ndarray): vetor usado no cálculo
+            chave (str): identifica o vetor temporário reaproveitado para esse argumento
+            copiar (bool): copia o conteúdo do vetor para o temporário
+
+        Retorna:
+            tuple: descrição (nome, formato e tipo) e o vetor temporário usado (ou None)
+        """
+        # Vetores que começam no início de uma memória compartilhada (como os primeiros N
+        # elementos de um vetor com folga de capacidade) são passados sem cópia
+        conhecido = self._vetores.get(vetor.ctypes.data)
+        if (
+            conhecido is not None
+            and vetor.flags.c_contiguous
+            and vetor.dtype == conhecido[0].dtype
+            and vetor.nbytes <= conhecido[0].nbytes
+        ):
+            nome, _, tipo = conhecido[1]
+            return (nome, vetor.shape, tipo), None
+        reserva = self._temporarios.get(chave)
+        if (
+            reserva is None
+            or reserva.dtype != vetor.dtype
+            or reserva.shape[1:] != vetor.shape[1:]
+            or len(reserva) < len(vetor)
+        ):
+            capacidade = len(vetor) if reserva is None else max(len(vetor), 2 * len(reserva))
+            nova = self.alocar((capacidade,) + vetor.shape[1:], vetor.dtype)
+            if reserva is not None:
+                self.liberar(reserva)
+            reserva = self._temporarios[chave] = nova
+        temporario = reserva[: len(vetor)]
+        if copiar:
+            temporario[...] = vetor
+        nome, _, tipo = self._vetores[reserva.ctypes.data][1]
+        return (nome, temporario.shape, tipo), temporario
+
+    def __call__(self, alvos, fontes, massa_fontes, saida=None):
+        """
+        Calcula as acelerações dos alvos dividindo o trabalho entre os processos
+
+        Parâmetros:
+            alvos (np.ndarray): posições (N, 2) dos corpos cuja aceleração será calculada
+            fontes (np.ndarray): posições (M, 2) dos corpos que exercem a força
+            massa_fontes (np.ndarray): massas (M,) dos corpos que exercem a força
+            saida (np.ndarray): vetor (N, 2) opcional onde o resultado será escrito
+
+        Retorna:
+            np.ndarray: acelerações (N, 2) dos alvos
+        """
+        n = len(alvos)
+        if saida is None:
+            saida = np.empty((n, 2))
+        descricao_saida, temporario_saida = self._descricao(saida, "saida", copiar=False)
+        descricoes = (
+            self._descricao(alvos, "alvos")[0],
+            self._descricao(fontes, "fontes")[0],
+            self._descricao(massa_fontes, "massa")[0],
+            descricao_saida,
+        )
+        blocos = max(1, min(n, self.processos * self.blocos_por_processo))
+        limites = np.linspace(0, n, blocos + 1).astype(int)
+        tarefas = [
+            descricoes + (int(inicio), int(fim), self.metodo, self.theta, tuple(self._liberadas))
+            for inicio, fim in zip(limites[:-1], limites[1:])
+            if fim > inicio
+        ]
+        self._pool.map(_calcular_bloco, tarefas)
+
+        # Se a saída não era compartilhada, o resultado ficou no vetor temporário
+        if temporario_saida is not None:
+            saida[...] = temporario_saida
+        return saida
+
+    def fechar(self):
+        """
+        Encerra os processos trabalhadores e libera a memória compartilhada
+        """
+        self._pool.close()
+        self._pool.join()
+        self._vetores.clear()
+        self._temporarios.clear()
+        self._liberadas.clear()
+        for memoria in self._memorias:
+            memoria.unlink()
+        self._pendentes.extend(self._memorias)
+        self._memorias.clear()
+        # Memórias com vetores ainda em uso são liberadas quando eles forem coletados
+        self._fechar_pendentes()
+        self._pendentes.clear()
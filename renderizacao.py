@@ -0,0 +1,223 @@
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+# Corpos com raio na tela até este valor são desenhados por escrita direta nos pixels;
+# os maiores (raros, só com muito zoom) continuam usando pygame.draw.circle
+RAIO_MAXIMO_CARIMBO = 4
+
+# Deslocamentos dos pixels de um círculo de cada raio (calculados uma única vez)
+_carimbos = {}
+
+
+def carimbo(raio):
+    """
+    Obtém os pixels que pygame.draw.circle pinta para um círculo de um determinado raio
+
+    O círculo é desenhado uma vez em uma superfície pequena, de forma que o desenho em lote fica
+    idêntico, pixel a pixel, ao desenho individual.
+
+    Parâmetro:
+        raio (int): raio do círculo em pixels
+
+    Retorna:
+        tuple: deslocamentos (dx, dy) dos pixels em relação ao centro
+    """
+    if raio not in _carimbos:
+        lado = 2 * raio + 3
+        superficie = pygame.Surface((lado, lado))
+        pygame.draw.circle(superficie, (255, 255, 255), (raio + 1, raio + 1), raio)
+        dx, dy = np.nonzero(pygame.surfarray.array2d(superficie))
+        _carimbos[raio] = (dx - (raio + 1), dy - (raio + 1))
+    return _carimbos[raio]
+
+
+def para_tela(pos, zoom, pan_x, pan_y, largura, altura):
+    """
+    Converte, de uma só vez, as posições de vários corpos para coordenadas inteiras da tela
+
+    Mesma conversão de world_to_screen, seguida do truncamento usado por pygame.draw.circle.
+
+    Parâmetros:
+        pos (np.ndarray): posições (N, 2) em espaço de simulação
+        zoom (float): fator de zoom
+        pan_x, pan_y (float): deslocamento da câmera
+        largura, altura (int): resolução da tela
+
+    Retorna:
+        tuple: coordenadas x e y (N,) na tela
+    """
+    tela_x = (pos[:, 0] - largura // 2) * zoom + largura // 2 + pan_x
+    tela_y = (pos[:, 1] - altura // 2) * zoom + altura // 2 + pan_y
+    return tela_x.astype(np.int64), tela_y.astype(np.int64)
+
+
+def desenhar_pontos(tela, pos, raios, cor, zoom, pan_x, pan_y):
+    """
+    Desenha muitos corpos pequenos com poucas escritas em lote nos pixels da tela
+
+    1. Converte todas as posições para a tela e descarta os corpos fora da área visível
+    2. Agrupa os corpos pelo raio desenhado
+    3. Para cada raio pequeno, escreve a cor em todos os pixels do carimbo de todos os corpos
+       do grupo (uma escrita vetorizada por pixel do carimbo)
+    4. Corpos com raio maior que RAIO_MAXIMO_CARIMBO são desenhados com pygame.draw.circle
+
+    Parâmetros:
+        tela (pygame.Surface): superfície onde os corpos serão desenhados
+        pos (np.ndarray): posições (N, 2) em espaço de simulação
+        raios (np.ndarray): raios (N,) dos corpos na tela, em pixels
+        cor (tuple): cor RGB dos corpos
+        zoom (float): fator de zoom
+        pan_x, pan_y (float): deslocamento da câmera
+    """
+    largura, altura = tela.get_size()
+    tela_x, tela_y = para_tela(pos, zoom, pan_x, pan_y, largura, altura)
+    visivel = (
+        (tela_x + raios >= 0) & (tela_x - raios < largura) & (tela_y + raios >= 0) & (tela_y - raios < altura)
+    )
+    tela_x, tela_y, raios = tela_x[visivel], tela_y[visivel], raios[visivel]
+
+    grandes = raios > RAIO_MAXIMO_CARIMBO
+    for px, py, raio in zip(tela_x[grandes].tolist(), tela_y[grandes].tolist(), raios[grandes].tolist()):
+        pygame.draw.circle(tela, cor, (px, py), raio)
+
+    valor = tela.map_rgb(cor)
+    pixels = pygame.surfarray.pixels2d(tela)
+    try:
+        for raio in np.unique(raios[~grandes]).tolist():
+            grupo = raios == raio
+            gx, gy = tela_x[grupo], tela_y[grupo]
+            for dx, dy in zip(*carimbo(raio)):
+                px = gx + dx
+                py = gy + dy
+                dentro = (px >= 0) & (px < largura) & (py >= 0) & (py < altura)
+                pixels[px[dentro], py[dentro]] = valor
+    finally:
+        # Libera o bloqueio da superfície para os demais desenhos
+        del pixels
+
+
+class CacheLRU:
+    """
+    Cache de tamanho limitado que descarta o item usado há mais tempo
+
+    Atributos:
+        capacidade (int): quantidade máxima de itens guardados
+    """
+
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave, criar):
+        """
+        Retorna o item guardado para a chave, criando-o se ainda não existir
+
+        Parâmetros:
+            chave (hashable): identifica o item; qualquer mudança na chave invalida o item antigo
+            criar (callable): função sem argumentos que cria o item
+
+        Retorna:
+            object: item guardado para a chave
+        """
+        item = self._itens.get(chave)
+        if item is not None:
+            self._itens.move_to_end(chave)
+            return item
+        item = criar()
+        self._itens[chave] = item
+        if len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+        return item
+
+
+class CacheRenderizacao:
+    """
+    Cache das camadas estáticas ou que mudam pouco entre quadros
+
+    - Fundo: tela preta com as órbitas dos planetas, identificado pelo centro e pelos raios na tela
+      (que dependem do zoom, do pan e da posição do Sol)
+    - Textos: superfícies de cada linha de texto, identificadas pelo texto e pela cor
+    - Dicas: quadro de informações do corpo sob o mouse, identificado pelo corpo e pelos valores
+
+    Cada camada é um CacheLRU de tamanho limitado: quando a chave muda, uma nova superfície é
+    criada e as antigas acabam descartadas. Em quadros sem mudanças, o desenho vira apenas blits.
+    """
+
+    def __init__(self, fonte, tamanho_tela, capacidade_textos=256, capacidade_dicas=32, capacidade_fundos=2):
+        """
+        Parâmetros:
+            fonte (pygame.font.Font): fonte usada nos textos
+            tamanho_tela (tuple): resolução da tela
+            capacidade_textos, capacidade_dicas, capacidade_fundos (int): limite de cada camada
+        """
+        self.fonte = fonte
+        self.tamanho_tela = tamanho_tela
+        self.textos = CacheLRU(capacidade_textos)
+        self.dicas = CacheLRU(capacidade_dicas)
+        self.fundos = CacheLRU(capacidade_fundos)
+
+    def texto(self, texto, cor=(255, 255, 255)):
+        """
+        Superfície com uma linha de texto renderizada
+
+        Parâmetros:
+            texto (str): texto a ser renderizado
+            cor (tuple): cor RGB do texto
+
+        Retorna:
+            pygame.Surface: texto renderizado
+        """
+        return self.textos.obter((texto, cor), lambda: self.fonte.render(texto, True, cor))
+
+    def fundo(self, centro, raios, cor_orbita=(30, 30, 30)):
+        """
+        Superfície opaca do tamanho da tela com o fundo preto e as órbitas dos planetas
+
+        Substitui o preenchimento da tela a cada quadro: copiar o fundo pronto custa o mesmo que
+        preenchê-lo, e as órbitas só são desenhadas de novo quando zoom, pan ou Sol mudam na tela.
+
+        Parâmetros:
+            centro (tuple): posição inteira do Sol na tela
+            raios (tuple): raios inteiros das órbitas na tela
+            cor_orbita (tuple): cor RGB das órbitas
+
+        Retorna:
+            pygame.Surface: fundo pronto para ser copiado na tela
+        """
+
+        def criar():
+            superficie = pygame.Surface(self.tamanho_tela).convert()
+            superficie.fill((0, 0, 0))
+            for raio in raios:
+                pygame.draw.circle(superficie, cor_orbita, centro, raio, 1)
+            return superficie
+
+        return self.fundos.obter((centro, raios, cor_orbita), criar)
+
+    def dica(self, corpo, linhas):
+        """
+        Quadro de informações exibido ao passar o mouse sobre um corpo
+
+        Parâmetros:
+            corpo (hashable): identifica o corpo
+            linhas (tuple): linhas de texto exibidas (incluem os valores atuais)
+
+        Retorna:
+            pygame.Surface: quadro de informações
+        """
+
+        def criar():
+            max_width = max(self.fonte.size(texto)[0] for texto in linhas)
+            info_height = len(linhas) * 20
+            info_surface = pygame.Surface((max_width + 10, info_height + 10))
+            info_surface.fill((50, 50, 50))
+            for i, texto in enumerate(linhas):
+                info_surface.blit(self.texto(texto), (5, 5 + i * 20))
+            return info_surface
+
+        return self.dicas.obter((corpo, linhas), criar)
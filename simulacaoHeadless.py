@@ -0,0 +1,308 @@
+import argparse
+import time
+
+import numpy as np
+
+from condicoesIniciais import (
+    ANO_SIMULADO,
+    ASTEROIDES_PARTICULAS_TESTE,
+    INTEGRADOR,
+    METODO_GRAVIDADE,
+    NUM_ASTEROIDS,
+    PROCESSOS_GRAVIDADE,
+    THETA_BARNES_HUT,
+    criar_corpos,
+    timeStep,
+)
+from fisica import MotorFisico
+from integradores import INTEGRADORES, Diagnostico, criar_integrador
+from trajetoria import GravadorTrajetoria, carregar_checkpoint, salvar_checkpoint
+
+
+def criar_motor(
+    num_asteroides=NUM_ASTEROIDS,
+    seed=None,
+    dt=timeStep,
+    metodo=METODO_GRAVIDADE,
+    theta=THETA_BARNES_HUT,
+    particulas_teste=ASTEROIDES_PARTICULAS_TESTE,
+    processos=PROCESSOS_GRAVIDADE,
+    integrador=INTEGRADOR,
+):
+    """
+    Monta o motor de física com as mesmas condições iniciais da visualização
+
+    Parâmetros:
+        num_asteroides (int): quantidade de asteroides no cinturão
+        seed (int): semente do gerador aleatório dos asteroides
+        dt (float): intervalo de tempo de cada passo
+        metodo (str): método usado no cálculo da gravidade ("direto" ou "barnes-hut")
+        theta (float): ângulo de abertura do Barnes–Hut
+        particulas_teste (bool): cria os asteroides como partículas de teste
+        processos (int): quantidade de processos usados no cálculo da gravidade
+        integrador (str ou object): integrador usado em cada passo (ver integradores.py)
+
+    Retorna:
+        MotorFisico: motor de física com os corpos (Sol, planetas e asteroides, nessa ordem)
+    """
+    corpos = criar_corpos(num_asteroides, seed=seed, dt=dt, particulas_teste=particulas_teste)
+    return MotorFisico(corpos, metodo=metodo, theta=theta, processos=processos, integrador=integrador)
+
+
+def executar(
+    motor,
+    passos,
+    dt,
+    passo=0,
+    tempo=0.0,
+    gravador=None,
+    checkpoint=None,
+    intervalo_checkpoint=0,
+    info=None,
+    diagnostico=None,
+    intervalo_diagnostico=0,
+):
+    """
+    Avança o motor até completar 'passos' passos, gravando a trajetória e os checkpoints
+
+    Quadros e checkpoints são gravados nos passos múltiplos dos respectivos intervalos, contados
+    desde o início da simulação, de forma que uma execução retomada grava os mesmos passos que uma
+    execução sem interrupção.
+
+    Parâmetros:
+        motor (MotorFisico): motor de física com o estado atual
+        passos (int): quantidade total de passos da simulação (incluindo os já executados)
+        dt (float): intervalo de tempo de cada passo
+        passo (int): passos já executados
+        tempo (float): tempo simulado até o estado atual
+        gravador (GravadorTrajetoria): trajetória onde os quadros são gravados (opcional)
+        checkpoint (str): arquivo .npz do checkpoint (opcional)
+        intervalo_checkpoint (int): passos entre dois checkpoints (0 grava apenas no final)
+        info (dict): informações extras guardadas no checkpoint
+        diagnostico (Diagnostico): instrumentação de energia e momento angular (opcional)
+        intervalo_diagnostico (int): passos entre duas medições do diagnóstico (0 mede apenas no final)
+
+    Retorna:
+        tuple: passo e tempo simulado ao final
+    """
+    info = info or {}
+
+    def salvar():
+        quadros = 0
+        if gravador is not None:
+            gravador.descarregar()
+            quadros = gravador.quadros
+        salvar_checkpoint(checkpoint, motor.corpos, passo, tempo, dt, quadros, **info)
+
+    while passo < passos:
+        motor.passo(dt)
+        passo += 1
+        tempo += dt
+        if gravador is not None and passo % gravador.intervalo == 0:
+            gravador.gravar(passo, tempo, motor.pos)
+        if checkpoint and intervalo_checkpoint and passo % intervalo_checkpoint == 0:
+            salvar()
+        if diagnostico is not None and intervalo_diagnostico and passo % intervalo_diagnostico == 0:
+            diagnostico.registrar(tempo)
+    if checkpoint:
+        salvar()
+    if diagnostico is not None:
+        diagnostico.registrar(tempo)
+    return passo, tempo
+
+
+def simular(passos, dt=timeStep, **opcoes):
+    """
+    Executa a simulação sem tela, o mais rápido que o processador permitir
+
+    Parâmetros:
+        passos (int): quantidade de passos de integração
+        dt (float): intervalo de tempo de cada passo
+        **opcoes: argumentos repassados para criar_motor (num_asteroides, seed, metodo...)
+
+    Retorna:
+        MotorFisico: motor de física com o estado final
+    """
+    motor = criar_motor(dt=dt, **opcoes)
+    executar(motor, passos, dt)
+    return motor
+
+
+# Valores padrão das opções da execução que são gravadas no checkpoint
+OPCOES_PADRAO = {
+    "metodo": METODO_GRAVIDADE,
+    "theta": THETA_BARNES_HUT,
+    "processos": PROCESSOS_GRAVIDADE,
+    "integrador": INTEGRADOR,
+    "eta": 0.01,
+    "niveis": 8,
+}
+
+# Opções que não alteram o resultado e podem mudar ao retomar (por exemplo, em outra máquina)
+OPCOES_LIVRES = ("processos",)
+
+
+def opcoes_execucao(args, gravadas):
+    """
+    Resolve as opções da execução a partir da linha de comando e de um checkpoint
+
+    Opções omitidas na linha de comando usam o valor gravado no checkpoint ou, sem ele, o valor
+    padrão. Assim uma execução retomada continua com exatamente o mesmo método e integrador, e
+    uma opção informada que contradiz o checkpoint gera ValueError. eta e niveis só existem para
+    o integrador adaptativo.
+
+    Parâmetros:
+        args (argparse.Namespace): argumentos da linha de comando (None para opções omitidas)
+        gravadas (dict): opções gravadas no checkpoint (vazio em uma execução nova)
+
+    Retorna:
+        dict: opções da execução
+    """
+    opcoes = {}
+    for nome, padrao in OPCOES_PADRAO.items():
+        informado, gravado = getattr(args, nome), gravadas.get(nome)
+        if informado is not None and gravado is not None and informado != gravado and nome not in OPCOES_LIVRES:
+            raise ValueError(f"--{nome} {informado} difere do valor do checkpoint ({gravado})")
+        opcoes[nome] = next(valor for valor in (informado, gravado, padrao) if valor is not None)
+    if opcoes["integrador"] != "adaptativo":
+        del opcoes["eta"], opcoes["niveis"]
+    return opcoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação do sistema solar sem tela")
+    parser.add_argument("--passos", type=int, default=10000, help="quantidade total de passos de integração")
+    parser.add_argument("--dt", type=float, default=timeStep, help="intervalo de tempo de cada passo")
+    parser.add_argument("--asteroides", type=int, default=NUM_ASTEROIDS, help="quantidade de asteroides")
+    parser.add_argument("--seed", type=int, default=None, help="semente do gerador dos asteroides")
+    # As opções da execução não têm padrão no parser: ao retomar, valem as gravadas no checkpoint
+    parser.add_argument("--metodo", choices=["direto", "barnes-hut"], default=None)
+    parser.add_argument("--theta", type=float, default=None)
+    parser.add_argument("--processos", type=int, default=None, help="processos usados no cálculo da gravidade")
+    parser.add_argument(
+        "--asteroides-massivos",
+        action="store_true",
+        default=not ASTEROIDES_PARTICULAS_TESTE,
+        help="faz os asteroides exercerem força em vez de serem partículas de teste",
+    )
+    parser.add_argument("--integrador", choices=list(INTEGRADORES), default=None)
+    parser.add_argument("--eta", type=float, default=None, help="fração da escala de tempo orbital (adaptativo)")
+    parser.add_argument("--niveis", type=int, default=None, help="subdivisões máximas do passo base (adaptativo)")
+    parser.add_argument(
+        "--diagnostico",
+        type=int,
+        default=0,
+        help="mede energia e momento angular a cada N passos e exibe o resumo (0 desativa)",
+    )
+    parser.add_argument("--saida", default=None, help="arquivo .npz onde o estado final será gravado")
+    parser.add_argument("--trajetoria", default=None, help="arquivo binário onde a trajetória será gravada")
+    parser.add_argument("--intervalo-gravacao", type=int, default=100, help="passos entre dois quadros gravados")
+    parser.add_argument(
+        "--precisao", type=int, choices=[32, 64], default=32, help="bits das coordenadas gravadas na trajetória"
+    )
+    parser.add_argument("--checkpoint", default=None, help="arquivo .npz do checkpoint")
+    parser.add_argument("--intervalo-checkpoint", type=int, default=10000, help="passos entre dois checkpoints")
+    parser.add_argument(
+        "--retomar",
+        action="store_true",
+        help="continua a execução a partir do checkpoint (e da trajetória gravada até ele)",
+    )
+    args = parser.parse_args()
+
+    estado = None
+    if args.retomar:
+        if not args.checkpoint:
+            parser.error("--retomar exige --checkpoint")
+        corpos, estado = carregar_checkpoint(args.checkpoint)
+    try:
+        opcoes = opcoes_execucao(args, estado.get("opcoes", {}) if estado else {})
+    except ValueError as erro:
+        parser.error(str(erro))
+    for nome, valor in opcoes.items():
+        setattr(args, nome, valor)
+
+    integrador = criar_integrador(args.integrador, **{k: opcoes[k] for k in ("eta", "niveis") if k in opcoes})
+    gravador = None
+    if args.retomar:
+        passo, tempo, dt = estado["passo"], estado["tempo"], estado["dt"]
+        motor = MotorFisico(
+            corpos, metodo=args.metodo, theta=args.theta, processos=args.processos, integrador=integrador
+        )
+        trajetoria = args.trajetoria or estado.get("trajetoria")
+        if trajetoria:
+            gravador = GravadorTrajetoria.continuar(trajetoria, estado["quadros"])
+        print(f"Retomando do passo {passo} ({len(corpos)} corpos)")
+    else:
+        passo, tempo, dt = 0, 0.0, args.dt
+        motor = criar_motor(
+            num_asteroides=args.asteroides,
+            seed=args.seed,
+            dt=dt,
+            metodo=args.metodo,
+            theta=args.theta,
+            particulas_teste=not args.asteroides_massivos,
+            processos=args.processos,
+            integrador=integrador,
+        )
+        trajetoria = args.trajetoria
+        if trajetoria:
+            gravador = GravadorTrajetoria.criar(
+                trajetoria,
+                motor.corpos,
+                dt,
+                intervalo=args.intervalo_gravacao,
+                tipo=np.float32 if args.precisao == 32 else np.float64,
+                metadados={
+                    "metodo": args.metodo,
+                    "theta": args.theta,
+                    "seed": args.seed,
+                    "integrador": args.integrador,
+                },
+            )
+            gravador.gravar(passo, tempo, motor.pos)
+
+    diagnostico = None
+    if args.diagnostico:
+        diagnostico = Diagnostico(motor, ANO_SIMULADO)
+        diagnostico.registrar(tempo)
+
+    inicio = time.perf_counter()
+    passo_inicial = passo
+    passo, tempo = executar(
+        motor,
+        args.passos,
+        dt,
+        passo,
+        tempo,
+        gravador=gravador,
+        checkpoint=args.checkpoint,
+        intervalo_checkpoint=args.intervalo_checkpoint,
+        info={"trajetoria": trajetoria, "opcoes": opcoes},
+        diagnostico=diagnostico,
+        intervalo_diagnostico=args.diagnostico,
+    )
+    duracao = time.perf_counter() - inicio
+    executados = passo - passo_inicial
+    print(
+        f"{executados} passos com {len(motor)} corpos em {duracao:.2f} s "
+        f"({executados / max(duracao, 1e-9):.1f} passos/s)"
+    )
+
+    if diagnostico is not None:
+        resumo = diagnostico.resumo()
+        print(
+            f"Integrador {args.integrador}: ΔE/E final {resumo['desvio_energia']:.3e} "
+            f"(máx {resumo['maior_desvio_energia']:.3e}), ΔL/L máx {resumo['maior_desvio_momento']:.3e}, "
+            f"{resumo['avaliacoes_por_ano']:.1f} avaliações de força por ano simulado"
+        )
+    if gravador is not None:
+        gravador.fechar()
+        print(f"Trajetória com {gravador.quadros} quadros gravada em {trajetoria}")
+    if args.saida:
+        salvar_checkpoint(args.saida, motor.corpos, passo, tempo, dt, opcoes=opcoes)
+        print(f"Estado final gravado em {args.saida}")
+    motor.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,356 +1,370 @@
+import argparse
 import math
-import random
 
+import numpy as np
 import pygame
 
-# Inicialização do pygame e configuração da janela de simulação
-# Configura a resolução da tela, inicializa o relógio e a fonte para renderização de texto
-pygame.init()
-imagemBrocolis = pygame.image.load("Image/brocolis.png")
-pygame.display.set_caption("Simulação de sistema solar")
-pygame.display.set_icon(imagemBrocolis)
-x, y = 1920, 1080
-tela = pygame.display.set_mode((x, y))
-clock = pygame.time.Clock()
-pygame.font.init()
-fonte = pygame.font.SysFont("Arial", 16)
-
-# Constantes físicas utilizadas na simulação
-G = 6.67430e-11  
-massaSol = 1.989e10  
-tamanhoSol = 1392.700  
-distanciaPlanetas = [57.9, 108.2, 149.6, 227.9, 778.5, 1432.0, 2867.0, 4515.0]
-massaPlanetas = [3.28e3, 4.83e4, 5.98e4, 6.40e3, 1.90e7, 5.68e6, 8.67e5, 1.05e6]
-tamanhoPlanetas = [4.879, 12.104, 12.756, 6.798, 142.964, 120.536, 51.118, 49.572]
-coresPlanetas = [
-    (169, 169, 169), 
-    (255, 215, 0),
-    (0, 191, 255),
-    (188, 39, 50),
-    (255, 140, 0),
-    (210, 180, 140),
-    (0, 255, 255),
-    (25, 25, 112),
-]
-nomesPlanetas = [
-    "Mercúrio",
-    "Vênus",
-    "Terra",
-    "Marte",
-    "Júpiter",
-    "Saturno",
-    "Urano",
-    "Netuno",
-]
-
-# Parâmetros de simulação
-timeStep = 1e1  # Intervalo de tempo para cada iteração da simulação
+from agendador import AgendadorFisico, PerfilQuadro
+from condicoesIniciais import (
+    INTEGRADOR,
+    METODO_GRAVIDADE,
+    NUM_ASTEROIDS,
+    PROCESSOS_GRAVIDADE,
+    THETA_BARNES_HUT,
+    criar_corpos,
+    nomesPlanetas,
+    timeStep,
+)
+from corpos import COR_PADRAO
+from fisica import MotorFisico
+from indiceEspacial import IndiceEspacial
+from renderizacao import CacheRenderizacao, desenhar_pontos
+from trajetoria import ReprodutorTrajetoria, Trajetoria
+
+# Parâmetros da visualização
+x, y = 1920, 1080  # Resolução da janela
 movimento_speed = 10  # Velocidade de movimento da câmera com teclas WASD
-
-# Configurações da área do cinturão de asteroides
-ASTEROID_BELT_INNER_RADIUS = 300 + (tamanhoSol / 2)  # Milhões de km
-ASTEROID_BELT_OUTER_RADIUS = 500 + (tamanhoSol / 2)  # Milhões de km
-NUM_ASTEROIDS = 250
+TAXA_QUADROS = 240  # Limite de quadros por segundo
+# Tempo simulado por segundo real (equivale a um passo por quadro a 240 quadros por segundo)
+taxaSimulacao = timeStep * TAXA_QUADROS
+ORCAMENTO_FISICA = 0.012  # Tempo real máximo (em segundos) gasto com física em cada quadro
+RAIO_SELECAO = 4  # Distância mínima (em pixels) do mouse para selecionar um corpo pequeno
+QUADROS_GRAVADOS_POR_SEGUNDO = 60  # Velocidade inicial da reprodução de uma trajetória
+CORES_PERFIL = [(230, 120, 60), (90, 170, 250), (120, 220, 120), (220, 200, 80), (160, 160, 160)]  # Cores das etapas no perfil de quadro (F3)
 
 # Variáveis para controle de zoom e pan
 zoom = 0.1  # Fator de zoom inicial
 pan_x = 0  # Deslocamento horizontal da câmera
 pan_y = 0  # Deslocamento vertical da câmera
 
-# Inicialização do Sol
-Sol = {
-    "nome": "Sol",
-    "massa": massaSol,
-    "tam": tamanhoSol,
-    "pos": pygame.Vector2(x // 2, y // 2),  # Posiciona o Sol no centro da tela
-    "antPos": pygame.Vector2(x // 2, y // 2),  # Posição anterior (usada para cálculo de velocidade)
-    "vel": pygame.Vector2(0, 0)  # Velocidade inicial (parado)
-}
-
-# Inicialização dos planetas
-# Cria uma lista de planetas com as devidas características necessárias (posição, velocidade etc.) para o desenvolvimento das funções
-planetas = []
-for i in range(len(massaPlanetas)):
-    angulo = i * (math.pi / 4)
-    distancia = distanciaPlanetas[i] + (tamanhoSol / 2)
-    pos = Sol["pos"] + pygame.Vector2(
-        math.cos(angulo) * distancia, math.sin(angulo) * distancia
-    )
-    # Calcula velocidade orbital com base na velocidade circular
-    velOrb = math.sqrt(G * massaSol / distancia)
-    vel = pygame.Vector2(-math.sin(angulo), math.cos(angulo)) * velOrb
-    planetas.append(
-        {
-            "nome": nomesPlanetas[i],
-            "massa": massaPlanetas[i],
-            "tam": tamanhoPlanetas[i],
-            "pos": pos,
-            "antPos": pos - vel * timeStep,  # Posição anterior calculada retroativamente
-            "raioOrbital": distancia,
-            "vel": vel,
-        }
-    )
-
-# Inicialização dos asteroides
-# Gera uma população de asteroides no cinturão de asteroides com posições e velocidades aleatórias
-asteroides = []
-for _ in range(NUM_ASTEROIDS):
-    raio_aleatorio = random.uniform(
-        ASTEROID_BELT_INNER_RADIUS, ASTEROID_BELT_OUTER_RADIUS
-    )
-    angulo = random.uniform(0, 2 * math.pi)
-    massa_asteroide = random.uniform(1e-6, 1e-4)
-    tamanho_asteroide = random.uniform(0.1, 2)
-    pos = Sol["pos"] + pygame.Vector2(
-        math.cos(angulo) * raio_aleatorio, math.sin(angulo) * raio_aleatorio
-    )
-    velOrb = math.sqrt(G * massaSol / raio_aleatorio)
-    vel = pygame.Vector2(-math.sin(angulo), math.cos(angulo)) * velOrb
-    asteroides.append(
-        {
-            "massa": massa_asteroide,
-            "tam": tamanho_asteroide,
-            "pos": pos,
-            "antPos": pos - vel * timeStep,
-            "vel": vel,
-        }
-    )
+SOL = 0
+indicesPlanetas = range(1, 1 + len(nomesPlanetas))
+inicioAsteroides = 1 + len(nomesPlanetas)
 
-def fGrav(m1, p1, m2, p2):
+def world_to_screen(pos):
     """
-    Cálculo da força gravitacional
-
-    1. Cria o vetor que parte da posição do planeta 2 (p2) para o planeta 1 (p1)
-    2. Guarda a distância entre eles
-    3. Calcula o módulo da força gravitacional resultante entre os planetas (guarda em 'magnitude')
-    4. Normaliza o vetor (guarda em 'dir')
-    5. Calcula e retorna o vetor força gravitacional (aplica o módulo da força na direção do vetor entre os planetas com 'magnitude * dir')
+    Converte as coordenadas do planeta para as coordenadas da tela levando em consideração zoom e pan
 
-    Parâmetros:
-        m1, m2 (float): massa dos planetas a serem analisados na função
-        p1, p2 (pygame.Vector2): coordenadas da posição dos planetas a serem analisados na função
+    Parâmetro:
+        pos (tuple): coordenadas (x, y) da posição original em espaço de simulação
 
     Retorna:
-        pygame.Vector2: vetor com magnitude da força gravitacional calculada entre dois planetas, apontando da posição de p1 para p2
+        pygame.Vector2: coordenadas da posição ajustada na tela de renderização
     """
-    vecDist = p1 - p2
-    dist = vecDist.length()
-    if dist == 0:
-        return pygame.Vector2(0, 0)
-    magnitude = G * (m1 * m2) / dist**2
-    dir = vecDist.normalize()
-    return magnitude * dir
+    screen_x = (pos[0] - x // 2) * zoom + x // 2 + pan_x
+    screen_y = (pos[1] - y // 2) * zoom + y // 2 + pan_y
+    return pygame.Vector2(screen_x, screen_y)
 
-def world_to_screen(pos):
+def screen_to_world(pos):
     """
-    Converte as coordenadas do planeta para as coordenadas da tela levando em consideração zoom e pan
+    Converte coordenadas da tela para o espaço de simulação (inverso de world_to_screen)
 
     Parâmetro:
-        pos (pygame.Vector2): coordenadas da posição original em espaço de simulação
+        pos (tuple): coordenadas (x, y) na tela
 
     Retorna:
-        pygame.Vector2: coordenadas da posição ajustada na tela de renderização
+        tuple: coordenadas (x, y) em espaço de simulação
     """
-    screen_x = (pos.x - x // 2) * zoom + x // 2 + pan_x
-    screen_y = (pos.y - y // 2) * zoom + y // 2 + pan_y
-    return pygame.Vector2(screen_x, screen_y)
+    world_x = (pos[0] - x // 2 - pan_x) / zoom + x // 2
+    world_y = (pos[1] - y // 2 - pan_y) / zoom + y // 2
+    return world_x, world_y
 
-def calc_velocidade(objeto):
+def calc_velocidade(corpos, indice):
     """
-    Calcula a velocidade atual do objeto em km/s
+    Calcula a velocidade atual de um corpo em km/s
 
-    1. Armazena a posição atual e posição anterior
-    2. Faz a diferença entre as duas e divide pelo tempo em que essa posição variou, chegando na nova velocidade
-    3. Multiplica a velocidade por 1000 para manter a escala
+    1. Usa a velocidade guardada pelo integrador: no Verlet, (posição atual - posição anterior) / timeStep
+       corrigida por aceleração * timeStep / 2; nos demais, a velocidade sincronizada com a posição atual
+    2. Multiplica a velocidade por 1000 para manter a escala
 
-    Parâmetro:
-        objeto (dict): dicionário contendo a posição atual e anterior do objeto
+    Parâmetros:
+        corpos (BodySystem): corpos da simulação
+        indice (int): índice do corpo
 
     Retorna:
-        float: velocidade do objeto em km/s
+        float: velocidade do corpo em km/s
     """
-    pos_atual = pygame.Vector2(objeto["pos"])
-    pos_anterior = pygame.Vector2(objeto["antPos"])
-    velocidade = (pos_atual - pos_anterior).length() / timeStep
-    return velocidade * 1000
+    vx, vy = corpos.vel[indice]
+    return math.hypot(vx, vy) * 1000
 
-def update_antPos(objetos):
+def informacoes_corpo(corpos, indice, posDesenho):
     """
-    Atualiza a posição anterior dos objetos
-
-    Usado para corrigir a posição anterior quando a velocidade é modificada
+    Monta as linhas do quadro de informações de um corpo
 
     Parâmetros:
-        objetos (list): Lista de objetos (planetas ou asteroides) a serem atualizados
+        corpos (BodySystem): corpos da simulação
+        indice (int): índice do corpo
+        posDesenho (np.ndarray): posições desenhadas de todos os corpos
+
+    Retorna:
+        tuple: linhas de texto exibidas
     """
-    for objeto in objetos:
-        objeto["antPos"] = objeto["pos"] - objeto["vel"] * timeStep
-
-# Loop principal da simulação
-running = True
-while running:
-    # Tratamento de eventos do Pygame 
-    for event in pygame.event.get():
-        # Fechamento da janela
-        if event.type == pygame.QUIT:
-            running = False
-        
-        # Tratamento de zoom com a roda do mouse
-        elif event.type == pygame.MOUSEWHEEL:
-            if event.y > 0:
-                zoom *= 1.1
-            else:
-                zoom /= 1.1
-
-        # Reset do movimento relativo com botão do meio do mouse
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 2:
-                pygame.mouse.get_rel()
-
-        # Movimentação da câmera (pan) com botão do meio do mouse
-        elif event.type == pygame.MOUSEMOTION:
-            if pygame.mouse.get_pressed()[1]:
-                rel_x, rel_y = pygame.mouse.get_rel()
-                pan_x += rel_x
-                pan_y += rel_y
-
-        # Controle de velocidade da simulação com teclas para cima/para baixo
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP and timeStep < 1e2:
-                timeStep *= 1.2
-                update_antPos([Sol] + planetas)
-                update_antPos(asteroides)
-            elif event.key == pygame.K_DOWN and timeStep > 0.1:
-                timeStep /= 1.2
-                update_antPos([Sol] + planetas)
-                update_antPos(asteroides)
-
-    # Controle de movimento da câmera com teclas WASD
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_w]:
-        pan_y += movimento_speed
-    if keys[pygame.K_s]:
-        pan_y -= movimento_speed
-    if keys[pygame.K_a]:
-        pan_x += movimento_speed
-    if keys[pygame.K_d]:
-        pan_x -= movimento_speed
-
-    # Simulação de física para Sol, planetas e asteroides
-    all_objects = [Sol] + planetas + asteroides
-
-    # Cálculo das forças gravitacionais e atualização de posições
-    for i, objeto in enumerate(all_objects):
-        # Força gravitacional total
-        fTotal = pygame.Vector2(0, 0)
-
-        # Forças gravitacionais entre todos os objetos
-        for j, objeto2 in enumerate(all_objects):
-            if i != j:
-                fTotal += fGrav(
-                    objeto2["massa"],
-                    objeto2["pos"],
-                    objeto["massa"],
-                    objeto["pos"]
-                )
-
-        # Cálculo de aceleração e atualização de posição
-        accel = fTotal / objeto["massa"]
-        nPos = 2 * objeto["pos"] - objeto["antPos"] + accel * (timeStep**2)
-        objeto["antPos"] = objeto["pos"]
-        objeto["pos"] = nPos
-        objeto["vel"] = (nPos - objeto["antPos"]) / timeStep
-
-    # Renderização
-    tela.fill((0, 0, 0))
-
-    # Variável para armazenar informações a serem exibidas
-    info_to_display = None
-
-    # Desenha o Sol
-    sol_pos = world_to_screen(Sol["pos"])
-    raio_sol = max(2, int((tamanhoSol / 2) * zoom))
-    pygame.draw.circle(tela, (255, 255, 0), (int(sol_pos.x), int(sol_pos.y)), raio_sol)
-
-    # Verifica se o mouse está sobre o Sol para exibir informações
-    mouse_pos = pygame.mouse.get_pos()
-    if (sol_pos - pygame.Vector2(mouse_pos)).length() < raio_sol:
-        vel_atual = calc_velocidade(Sol)
-        info_to_display = {
-            "pos": (int(sol_pos.x) + raio_sol + 5, int(sol_pos.y) - 30),
-            "text": [
-                "Sol",
-                f"Massa: {massaSol*1e20:.2e} kg",
-                f"Diâmetro: {tamanhoSol:.1f} mil km",
-                f"Velocidade: {vel_atual:.2f} km/s",
-            ],
-        }
-
-    # Desenha as órbitas dos planetas
-    for planeta in planetas:
-        raio_orbital = planeta["raioOrbital"] * zoom
-        pygame.draw.circle(
-            tela, (30, 30, 30), (int(sol_pos.x), int(sol_pos.y)), int(raio_orbital), 1
+    vel_atual = calc_velocidade(corpos, indice)
+    if indice == SOL:
+        return (
+            corpos.nomes[SOL],
+            f"Massa: {corpos.massa[SOL]*1e20:.2e} kg",
+            f"Diâmetro: {2 * corpos.raio[SOL]:.1f} mil km",
+            f"Velocidade: {vel_atual:.2f} km/s",
         )
+    if indice < inicioAsteroides:
+        nome = corpos.nomes[indice]
+        distancia = corpos.raioOrbital[indice]
+    else:
+        nome = f"Asteroide {indice - inicioAsteroides + 1}"
+        distancia = math.dist(posDesenho[indice].tolist(), posDesenho[SOL].tolist())
+    return (
+        f"Nome: {nome}",
+        f"Massa: {corpos.massa[indice]*1e20:.2e} kg",
+        f"Distância do Sol: {distancia:.1f} milhões km",
+        f"Velocidade: {vel_atual:.2f} km/s",
+        f"Diâmetro: {2 * corpos.raio[indice]:.3f} mil km",
+    )
 
-    # Desenha os planetas
-    for i, planeta in enumerate(planetas):
-        cor = coresPlanetas[i]
-        planeta_pos = world_to_screen(planeta["pos"])
-        raio = max(2, int((planeta["tam"] / 2) * zoom))
-        pygame.draw.circle(tela, cor, (int(planeta_pos.x), int(planeta_pos.y)), raio)
+def posicoes_desenho(corpos, alpha=1.0):
+    """
+    Calcula as posições desenhadas de todos os corpos
 
-        # Verifica se o mouse está sobre o planeta para exibir informações
-        if (planeta_pos - pygame.Vector2(mouse_pos)).length() < raio:
-            vel_atual = calc_velocidade(planeta)
-            info_to_display = {
-                "pos": (int(planeta_pos.x) + raio + 5, int(planeta_pos.y) - 50),
-                "text": [
-                    f"Nome: {planeta['nome']}",
-                    f"Massa: {planeta['massa']*1e20:.2e} kg",
-                    f"Distância do Sol: {planeta['raioOrbital']:.1f} milhões km",
-                    f"Velocidade: {vel_atual:.2f} km/s",
-                    f"Diâmetro: {planeta['tam']:.3f} mil km",
-                ],
-            }
+    A posição é interpolada entre o passo anterior e o atual, de forma que o movimento desenhado
+    fica suave mesmo quando um quadro não coincide com um passo da física.
+
+    Parâmetros:
+        corpos (BodySystem): corpos com o estado atualizado
+        alpha (float): fração entre o passo anterior (0) e o atual (1)
 
-    # Desenha os asteroides
-    for asteroide in asteroides:
-        asteroide_pos = world_to_screen(asteroide["pos"])
-        raio = max(1, int(asteroide["tam"] * zoom * 0.5))
-        pygame.draw.circle(
-            tela, (150, 150, 150), (int(asteroide_pos.x), int(asteroide_pos.y)), raio
+    Retorna:
+        np.ndarray: posições (N, 2) a serem desenhadas
+    """
+    posDesenho = corpos.pos - corpos.antPos
+    posDesenho *= alpha
+    posDesenho += corpos.antPos
+    return posDesenho
+
+def main():
+    """
+    Abre a janela e executa o laço principal da visualização (ou da reprodução de uma trajetória)
+
+    Fica fora do nível do módulo para que os processos trabalhadores do cálculo em paralelo,
+    que importam este arquivo ao serem iniciados por spawn (padrão no macOS e no Windows), não
+    abram outra janela nem criem outro motor de física.
+    """
+    global zoom, pan_x, pan_y
+
+    # Com --reproduzir, as posições vêm de uma trajetória gravada em vez de serem integradas
+    parser = argparse.ArgumentParser(description="Visualização da simulação do sistema solar")
+    parser.add_argument("--reproduzir", default=None, help="arquivo de trajetória gravado por simulacaoHeadless.py")
+    args = parser.parse_args()
+
+    # Inicialização do pygame e configuração da janela de simulação
+    # Configura a resolução da tela, inicializa o relógio e a fonte para renderização de texto
+    pygame.init()
+    imagemBrocolis = pygame.image.load("Image/brocolis.png")
+    pygame.display.set_caption("Simulação de sistema solar")
+    pygame.display.set_icon(imagemBrocolis)
+    tela = pygame.display.set_mode((x, y))
+    clock = pygame.time.Clock()
+    pygame.font.init()
+    fonte = pygame.font.SysFont("Arial", 16)
+    # Cache das camadas estáticas (fundo com órbitas, textos e quadro de informações)
+    cache = CacheRenderizacao(fonte, (x, y))
+
+    # Inicialização do Sol, dos planetas e dos asteroides
+    # Todos os corpos ficam em um BodySystem: o Sol no índice 0, seguido dos planetas e dos asteroides
+    if args.reproduzir:
+        trajetoria = Trajetoria(args.reproduzir)
+        corpos = trajetoria.corpos()
+    else:
+        corpos = criar_corpos(NUM_ASTEROIDS, dt=timeStep)
+
+    if args.reproduzir:
+        # Reprodução: cada passo do agendador carrega o próximo quadro gravado nos vetores dos corpos
+        motor = None
+        reprodutor = ReprodutorTrajetoria(trajetoria, corpos)
+        passo_agendador = reprodutor.passo
+        nomeIntegrador = trajetoria.metadados.get("integrador", "verlet")
+        dtAgendador = trajetoria.dt_quadro
+        taxa = dtAgendador * QUADROS_GRAVADOS_POR_SEGUNDO
+    else:
+        # Simulação de física para Sol, planetas e asteroides
+        # O motor integra os vetores do BodySystem no próprio lugar
+        motor = MotorFisico(
+            corpos,
+            metodo=METODO_GRAVIDADE,
+            theta=THETA_BARNES_HUT,
+            processos=PROCESSOS_GRAVIDADE,
+            integrador=INTEGRADOR,
         )
+        passo_agendador = motor.passo
+        nomeIntegrador = motor.integrador.nome
+        dtAgendador = timeStep
+        taxa = taxaSimulacao
+
+    # Passo da física fixo, com quantidade variável de passos por quadro
+    agendador = AgendadorFisico(dtAgendador, taxa, orcamento=ORCAMENTO_FISICA)
+    tempo_real = 0.0
+    pausado = False
+
+    # Perfil de cada quadro (eventos, física e renderização), exibido com F3
+    perfil = PerfilQuadro()
+    mostrarPerfil = False
+
+    # Loop principal da simulação
+    running = True
+    while running:
+        # Tratamento de eventos do Pygame 
+        for event in pygame.event.get():
+            # Fechamento da janela
+            if event.type == pygame.QUIT:
+                running = False
+
+            # Tratamento de zoom com a roda do mouse
+            elif event.type == pygame.MOUSEWHEEL:
+                if event.y > 0:
+                    zoom *= 1.1
+                else:
+                    zoom /= 1.1
+
+            # Reset do movimento relativo com botão do meio do mouse
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 2:
+                    pygame.mouse.get_rel()
+
+            # Movimentação da câmera (pan) com botão do meio do mouse
+            elif event.type == pygame.MOUSEMOTION:
+                if pygame.mouse.get_pressed()[1]:
+                    rel_x, rel_y = pygame.mouse.get_rel()
+                    pan_x += rel_x
+                    pan_y += rel_y
+
+            # Controle de velocidade da simulação com teclas para cima/para baixo
+            elif event.type == pygame.KEYDOWN:
+                # O passo da física continua fixo: muda apenas o tempo simulado por segundo real
+                if event.key == pygame.K_UP and agendador.taxa < 1e6:
+                    agendador.taxa *= 1.2
+                elif event.key == pygame.K_DOWN and agendador.taxa > 10:
+                    agendador.taxa /= 1.2
+                elif event.key == pygame.K_SPACE:
+                    pausado = not pausado
+                elif event.key == pygame.K_F3:
+                    mostrarPerfil = not mostrarPerfil
+                # Na reprodução, setas para os lados avançam ou voltam 5% da trajetória
+                elif args.reproduzir and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    salto = max(1, len(trajetoria) // 20)
+                    reprodutor.ir_para(reprodutor.quadro + (salto if event.key == pygame.K_RIGHT else -salto))
+
+        # Controle de movimento da câmera com teclas WASD
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_w]:
+            pan_y += movimento_speed
+        if keys[pygame.K_s]:
+            pan_y -= movimento_speed
+        if keys[pygame.K_a]:
+            pan_x += movimento_speed
+        if keys[pygame.K_d]:
+            pan_x -= movimento_speed
+
+        perfil.marcar("Eventos")
+
+        # Cálculo das forças gravitacionais e atualização de posições de todos os corpos em lote
+        # Quando a física está atrasada o quadro não é desenhado, mas os eventos continuam sendo tratados
+        desenhar = agendador.avancar(0.0 if pausado else tempo_real, passo_agendador)
+        perfil.marcar("Física")
+        if not desenhar:
+            tempo_real = clock.tick(TAXA_QUADROS) / 1000
+            perfil.marcar("Espera")
+            continue
+        posDesenho = posicoes_desenho(corpos, agendador.alpha)
+
+        # Renderização
+        # O fundo (tela preta com as órbitas dos planetas) vem do cache e só é redesenhado quando
+        # zoom, pan ou a posição do Sol na tela mudam
+        sol_pos = world_to_screen(posDesenho[SOL])
+        raios_orbitas = tuple(int(raio * zoom) for raio in corpos.raioOrbital[indicesPlanetas].tolist())
+        tela.blit(cache.fundo((int(sol_pos.x), int(sol_pos.y)), raios_orbitas), (0, 0))
+
+        # Índice espacial das posições desenhadas, usado para o corpo sob o mouse e para o recorte da tela
+        indice = IndiceEspacial(posDesenho, corpos.raio)
+
+        # Desenha o Sol
+        raio_sol = max(2, int(corpos.raio[SOL] * zoom))
+        pygame.draw.circle(tela, corpos.cores[SOL], (int(sol_pos.x), int(sol_pos.y)), raio_sol)
+
+        # Desenha os planetas
+        for i in indicesPlanetas:
+            planeta_pos = world_to_screen(posDesenho[i])
+            raio = max(2, int(corpos.raio[i] * zoom))
+            pygame.draw.circle(tela, corpos.cores[i], (int(planeta_pos.x), int(planeta_pos.y)), raio)
+
+        # Desenha apenas os asteroides dentro da área visível (com margem de um pixel)
+        xmin, ymin = screen_to_world((-1, -1))
+        xmax, ymax = screen_to_world((x + 1, y + 1))
+        visiveis = indice.no_retangulo(xmin, ymin, xmax, ymax)
+        visiveis = visiveis[visiveis >= inicioAsteroides]
+        raios = np.maximum(1, (corpos.raio[visiveis] * zoom).astype(np.int64))
+        desenhar_pontos(tela, posDesenho[visiveis], raios, COR_PADRAO, zoom, pan_x, pan_y)
+
+        # Verifica se o mouse está sobre algum corpo para exibir informações
+        info_to_display = None
+        mouse_x, mouse_y = screen_to_world(pygame.mouse.get_pos())
+        selecionado = indice.no_ponto(mouse_x, mouse_y, RAIO_SELECAO / zoom)
+        if selecionado >= 0:
+            corpo_pos = world_to_screen(posDesenho[selecionado])
+            raio = max(1, int(corpos.raio[selecionado] * zoom))
+            info_to_display = {
+                "corpo": selecionado,
+                "pos": (int(corpo_pos.x) + raio + 5, int(corpo_pos.y) - 30),
+                "text": informacoes_corpo(corpos, selecionado, posDesenho),
+            }
 
-    # Desenha as informações
-    if info_to_display:
-        max_width = max(fonte.size(texto)[0] for texto in info_to_display["text"])
-        info_height = len(info_to_display["text"]) * 20
-        info_surface = pygame.Surface((max_width + 10, info_height + 10))
-        info_surface.fill((50, 50, 50))
-
-        for i, texto in enumerate(info_to_display["text"]):
-            texto_surface = fonte.render(texto, True, (255, 255, 255))
-            info_surface.blit(texto_surface, (5, 5 + i * 20))
-
-        tela.blit(info_surface, info_to_display["pos"])
-
-    # Desenha informações de controle na tela
-    controles = [
-        "Controles:",
-        "WASD - Mover câmera",
-        "Roda do mouse - Zoom",
-        "Botão do meio do mouse - Pan",
-        "Setas cima/baixo - Ajustar velocidade da simulação",
-        f"TimeStep atual: {timeStep:.2e}",
-        f"Asteroides: {len(asteroides)}",
-    ]
-
-    for i, texto in enumerate(controles):
-        texto_surface = fonte.render(texto, True, (255, 255, 255))
-        tela.blit(texto_surface, (10, 10 + i * 20))
-
-    pygame.display.flip()
-    clock.tick(240)
-
-pygame.quit()
+        # Desenha as informações (o quadro só é recriado quando o corpo ou os valores exibidos mudam)
+        if info_to_display:
+            info_surface = cache.dica(info_to_display["corpo"], info_to_display["text"])
+            tela.blit(info_surface, info_to_display["pos"])
+
+        # Desenha informações de controle na tela
+        controles = [
+            "Controles:",
+            "WASD - Mover câmera",
+            "Roda do mouse - Zoom",
+            "Botão do meio do mouse - Pan",
+            "Setas cima/baixo - Ajustar velocidade da simulação",
+            "Espaço - Pausar",
+            "F3 - Perfil de cada quadro",
+            f"TimeStep da física: {trajetoria.dt if args.reproduzir else timeStep:.2e}",
+            f"Velocidade da simulação: {agendador.taxa:.2e} por segundo",
+            f"Passos no último quadro: {agendador.passos_ultimo_quadro}",
+            f"Integrador: {nomeIntegrador}",
+            f"Asteroides: {len(corpos) - inicioAsteroides}",
+        ]
+        if args.reproduzir:
+            controles += [
+                "Setas esquerda/direita - Voltar/avançar na trajetória",
+                f"Reproduzindo: {args.reproduzir}",
+                f"Quadro: {reprodutor.quadro + 1}/{len(trajetoria)}",
+            ]
+
+        for i, texto in enumerate(controles):
+            tela.blit(cache.texto(texto), (10, 10 + i * 20))
+
+        # Perfil: tempo médio de cada etapa do quadro, em milissegundos e em barras proporcionais
+        if mostrarPerfil:
+            linhas = [f"Quadro: {perfil.total * 1000:.1f} ms ({1 / max(perfil.total, 1e-9):.0f} quadros/s)"]
+            linhas += [f"{etapa}: {media * 1000:.1f} ms" for etapa, media in perfil.medias.items()]
+            for i, texto in enumerate(linhas):
+                tela.blit(cache.texto(texto), (x - 320, 10 + i * 20))
+                if i > 0:
+                    largura = int(120 * list(perfil.medias.values())[i - 1] / max(perfil.total, 1e-9))
+                    pygame.draw.rect(tela, CORES_PERFIL[(i - 1) % len(CORES_PERFIL)], (x - 140, 14 + i * 20, largura, 12))
+        perfil.marcar("Renderização")
+
+        pygame.display.flip()
+        perfil.marcar("Apresentação")
+        tempo_real = clock.tick(TAXA_QUADROS) / 1000
+        perfil.marcar("Espera")
+
+    if motor is not None:
+        motor.fechar()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
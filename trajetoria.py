@@ -0,0 +1,442 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from corpos import BodySystem
+
+# Identificação e versão do formato de trajetória
+MAGICO = b"SSTRAJ01"
+VERSAO = 1
+
+# Cabeçalho fixo: mágico, versão, bytes por coordenada (4 ou 8), quantidade de corpos,
+# passos entre quadros, dt da física, tamanho dos metadados em JSON e início dos quadros
+_CABECALHO = struct.Struct("<8sIIQQdQQ")
+
+# Os quadros começam em um deslocamento múltiplo deste valor
+ALINHAMENTO = 64
+
+# Dados fixos de cada corpo, gravados uma única vez logo após os metadados
+_TIPO_ESTATICO = np.dtype(
+    [
+        ("massa", "<f8"),
+        ("raio", "<f8"),
+        ("raioOrbital", "<f8"),
+        ("cor", "u1", (3,)),
+        ("particulaTeste", "?"),
+    ]
+)
+
+
+def _alinhar(deslocamento, alinhamento):
+    return -(-deslocamento // alinhamento) * alinhamento
+
+
+def tipo_quadro(num_corpos, tipo=np.float32):
+    """
+    Tipo estruturado de um quadro da trajetória
+
+    Cada quadro guarda o passo, o tempo simulado e as posições de todos os corpos.
+
+    Parâmetros:
+        num_corpos (int): quantidade de corpos
+        tipo (np.dtype): tipo das coordenadas (np.float32 ou np.float64)
+
+    Retorna:
+        np.dtype: tipo de um quadro
+    """
+    tipo = np.dtype(tipo).newbyteorder("<")
+    return np.dtype([("passo", "<i8"), ("tempo", "<f8"), ("pos", tipo, (num_corpos, 2))])
+
+
+def ler_cabecalho(arquivo):
+    """
+    Lê o cabeçalho e os metadados de um arquivo de trajetória
+
+    Parâmetro:
+        arquivo (file): arquivo binário aberto, posicionado em qualquer lugar
+
+    Retorna:
+        dict: versao, tipo, num_corpos, intervalo, dt, metadados, inicio_estatico e inicio_quadros
+    """
+    arquivo.seek(0)
+    dados = arquivo.read(_CABECALHO.size)
+    if len(dados) < _CABECALHO.size or dados[:8] != MAGICO:
+        raise ValueError("arquivo não é uma trajetória do sistema solar")
+    _, versao, bytes_coordenada, num_corpos, intervalo, dt, tamanho_metadados, inicio_quadros = _CABECALHO.unpack(
+        dados
+    )
+    if versao != VERSAO:
+        raise ValueError(f"versão {versao} do formato de trajetória não suportada")
+    metadados = json.loads(arquivo.read(tamanho_metadados).decode("utf-8"))
+    return {
+        "versao": versao,
+        "tipo": np.dtype(f"<f{bytes_coordenada}"),
+        "num_corpos": num_corpos,
+        "intervalo": intervalo,
+        "dt": dt,
+        "metadados": metadados,
+        "inicio_estatico": _alinhar(_CABECALHO.size + tamanho_metadados, 8),
+        "inicio_quadros": inicio_quadros,
+    }
+
+
+def salvar_checkpoint(caminho, corpos, passo, tempo, dt, quadros=0, **info):
+    """
+    Grava o estado completo da simulação, em precisão total, para retomar a execução depois
+
+    O arquivo é escrito com outro nome e só então renomeado, de forma que uma interrupção durante
+    a gravação nunca deixa um checkpoint corrompido no lugar do anterior.
+
+    Parâmetros:
+        caminho (str): arquivo .npz do checkpoint
+        corpos (BodySystem): corpos com o estado atual
+        passo (int): passos da física já executados
+        tempo (float): tempo simulado até o estado atual
+        dt (float): intervalo de tempo de cada passo
+        quadros (int): quadros da trajetória gravados até o estado atual
+        **info: informações extras da execução (por exemplo, o arquivo da trajetória)
+    """
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "wb") as arquivo:
+        np.savez(
+            arquivo,
+            nomes=np.array(corpos.nomes, dtype=str),
+            cores=np.array(corpos.cores, dtype=np.uint8).reshape(len(corpos), 3),
+            pos=corpos.pos,
+            antPos=corpos.antPos,
+            vel=corpos.vel,
+            massa=corpos.massa,
+            raio=corpos.raio,
+            raioOrbital=corpos.raioOrbital,
+            particulaTeste=corpos.particulaTeste,
+            passo=passo,
+            tempo=tempo,
+            dt=dt,
+            quadros=quadros,
+            info=json.dumps(info, ensure_ascii=False),
+        )
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+def carregar_checkpoint(caminho):
+    """
+    Lê um checkpoint gravado por salvar_checkpoint
+
+    Parâmetro:
+        caminho (str): arquivo .npz do checkpoint
+
+    Retorna:
+        tuple: corpos (BodySystem) e um dict com passo, tempo, dt, quadros e as informações extras
+    """
+    with np.load(caminho) as dados:
+        n = len(dados["massa"])
+        corpos = BodySystem(capacidade=n)
+        corpos.adicionar_lote(
+            dados["massa"],
+            dados["raio"],
+            dados["pos"],
+            dados["vel"],
+            dados["antPos"],
+            nome=dados["nomes"].tolist(),
+            cor=[tuple(cor) for cor in dados["cores"].tolist()],
+            particulaTeste=dados["particulaTeste"],
+            raioOrbital=dados["raioOrbital"],
+        )
+        estado = {
+            "passo": int(dados["passo"]),
+            "tempo": float(dados["tempo"]),
+            "dt": float(dados["dt"]),
+            "quadros": int(dados["quadros"]),
+            **json.loads(str(dados["info"])),
+        }
+    return corpos, estado
+
+
+class GravadorTrajetoria:
+    """
+    Grava uma trajetória em um arquivo binário, um quadro a cada 'intervalo' passos
+
+    Formato do arquivo (little-endian):
+        - cabeçalho fixo (_CABECALHO) e metadados em JSON (nomes dos corpos e opções da execução)
+        - dados fixos de cada corpo (_TIPO_ESTATICO)
+        - quadros (tipo_quadro) a partir de um deslocamento alinhado, um após o outro
+
+    A quantidade de quadros não fica no cabeçalho: ela é obtida pelo tamanho do arquivo, de forma
+    que os quadros são apenas acrescentados ao final e um quadro incompleto (execução interrompida
+    durante a escrita) é ignorado na leitura.
+
+    Atributos:
+        caminho (str): arquivo da trajetória
+        intervalo (int): passos da física entre dois quadros
+        quadros (int): quantidade de quadros já gravados
+    """
+
+    def __init__(self, caminho, cabecalho, quadros):
+        self.caminho = caminho
+        self.intervalo = cabecalho["intervalo"]
+        self.quadros = quadros
+        self._inicio_quadros = cabecalho["inicio_quadros"]
+        self._num_corpos = cabecalho["num_corpos"]
+        # Quadro reaproveitado a cada gravação
+        self._quadro = np.zeros(1, dtype=tipo_quadro(self._num_corpos, cabecalho["tipo"]))
+        self._arquivo = open(caminho, "r+b")
+        self._arquivo.truncate(self._inicio_quadros + quadros * self._quadro.itemsize)
+        self._arquivo.seek(0, os.SEEK_END)
+
+    @classmethod
+    def criar(cls, caminho, corpos, dt, intervalo=1, tipo=np.float32, metadados=None):
+        """
+        Cria um arquivo de trajetória novo (sobrescrevendo um existente)
+
+        Parâmetros:
+            caminho (str): arquivo da trajetória
+            corpos (BodySystem): corpos gravados (a quantidade fica fixa no arquivo)
+            dt (float): intervalo de tempo de cada passo da física
+            intervalo (int): passos da física entre dois quadros
+            tipo (np.dtype): tipo das coordenadas gravadas (np.float32 ou np.float64)
+            metadados (dict): informações extras da execução, serializáveis em JSON
+
+        Retorna:
+            GravadorTrajetoria: gravador sem nenhum quadro
+        """
+        tipo = np.dtype(tipo)
+        if tipo not in (np.float32, np.float64):
+            raise ValueError("as coordenadas devem ser float32 ou float64")
+        n = len(corpos)
+        texto = json.dumps({"nomes": corpos.nomes, **(metadados or {})}, ensure_ascii=False).encode("utf-8")
+        inicio_estatico = _alinhar(_CABECALHO.size + len(texto), 8)
+        inicio_quadros = _alinhar(inicio_estatico + n * _TIPO_ESTATICO.itemsize, ALINHAMENTO)
+
+        estatico = np.zeros(n, dtype=_TIPO_ESTATICO)
+        estatico["massa"] = corpos.massa
+        estatico["raio"] = corpos.raio
+        estatico["raioOrbital"] = corpos.raioOrbital
+        estatico["cor"] = np.array(corpos.cores, dtype=np.uint8).reshape(n, 3)
+        estatico["particulaTeste"] = corpos.particulaTeste
+
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(
+                _CABECALHO.pack(MAGICO, VERSAO, tipo.itemsize, n, intervalo, dt, len(texto), inicio_quadros)
+            )
+            arquivo.write(texto)
+            arquivo.seek(inicio_estatico)
+            arquivo.write(estatico.tobytes())
+            arquivo.truncate(inicio_quadros)
+
+        with open(caminho, "rb") as arquivo:
+            cabecalho = ler_cabecalho(arquivo)
+        return cls(caminho, cabecalho, 0)
+
+    @classmethod
+    def continuar(cls, caminho, quadros):
+        """
+        Reabre uma trajetória para continuar a gravação a partir de um checkpoint
+
+        Quadros gravados depois do checkpoint são descartados, de forma que a trajetória continua
+        exatamente do estado retomado.
+
+        Parâmetros:
+            caminho (str): arquivo da trajetória
+            quadros (int): quantidade de quadros gravados até o checkpoint
+
+        Retorna:
+            GravadorTrajetoria: gravador posicionado após o último quadro mantido
+        """
+        with open(caminho, "rb") as arquivo:
+            cabecalho = ler_cabecalho(arquivo)
+        tamanho = tipo_quadro(cabecalho["num_corpos"], cabecalho["tipo"]).itemsize
+        existentes = (os.path.getsize(caminho) - cabecalho["inicio_quadros"]) // tamanho
+        if quadros > existentes:
+            raise ValueError(f"a trajetória tem {existentes} quadros, mas o checkpoint espera {quadros}")
+        return cls(caminho, cabecalho, quadros)
+
+    def gravar(self, passo, tempo, pos):
+        """
+        Acrescenta um quadro ao final do arquivo
+
+        Parâmetros:
+            passo (int): passo da física do quadro
+            tempo (float): tempo simulado do quadro
+            pos (np.ndarray): posições (N, 2) dos corpos
+        """
+        if len(pos) != self._num_corpos:
+            raise ValueError(f"a trajetória foi criada com {self._num_corpos} corpos, não {len(pos)}")
+        quadro = self._quadro[0]
+        quadro["passo"] = passo
+        quadro["tempo"] = tempo
+        quadro["pos"] = pos
+        self._arquivo.write(self._quadro.data)
+        self.quadros += 1
+
+    def descarregar(self):
+        """
+        Garante que os quadros gravados chegaram ao arquivo (usado antes de cada checkpoint)
+        """
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+class Trajetoria:
+    """
+    Leitura de uma trajetória gravada, sem carregar os quadros na memória
+
+    Os quadros são acessados por um np.memmap: apenas as páginas efetivamente lidas saem do
+    disco, de forma que trajetórias maiores que a memória podem ser percorridas, reproduzidas e
+    analisadas (por exemplo, trajetoria.pos[:, 3] é a trajetória inteira da Terra).
+
+    Atributos:
+        caminho (str): arquivo da trajetória
+        dt (float): intervalo de tempo de cada passo da física
+        intervalo (int): passos da física entre dois quadros
+        num_corpos (int): quantidade de corpos
+        metadados (dict): nomes dos corpos e informações da execução
+        estatico (np.ndarray): massa, raio, raioOrbital, cor e particulaTeste de cada corpo
+        quadros (np.memmap): quadros gravados (passo, tempo e pos)
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        with open(caminho, "rb") as arquivo:
+            cabecalho = ler_cabecalho(arquivo)
+            self.num_corpos = cabecalho["num_corpos"]
+            arquivo.seek(cabecalho["inicio_estatico"])
+            self.estatico = np.fromfile(arquivo, dtype=_TIPO_ESTATICO, count=self.num_corpos)
+        self.dt = cabecalho["dt"]
+        self.intervalo = cabecalho["intervalo"]
+        self.tipo = cabecalho["tipo"]
+        self.metadados = cabecalho["metadados"]
+        self._inicio_quadros = cabecalho["inicio_quadros"]
+        self._tipo_quadro = tipo_quadro(self.num_corpos, self.tipo)
+        self.quadros = None
+        self.atualizar()
+
+    def __len__(self):
+        return len(self.quadros)
+
+    @property
+    def pos(self):
+        """np.ndarray: posições (F, N, 2) de todos os quadros, lidas sob demanda"""
+        return self.quadros["pos"]
+
+    @property
+    def passo(self):
+        """np.ndarray: passo da física (F,) de cada quadro"""
+        return self.quadros["passo"]
+
+    @property
+    def tempo(self):
+        """np.ndarray: tempo simulado (F,) de cada quadro"""
+        return self.quadros["tempo"]
+
+    @property
+    def dt_quadro(self):
+        """float: tempo simulado entre dois quadros"""
+        return self.dt * self.intervalo
+
+    def atualizar(self):
+        """
+        Mapeia novamente o arquivo se novos quadros foram gravados (trajetória ainda em execução)
+
+        Retorna:
+            bool: True se a quantidade de quadros mudou
+        """
+        quadros = max(0, os.path.getsize(self.caminho) - self._inicio_quadros) // self._tipo_quadro.itemsize
+        if self.quadros is not None and quadros == len(self.quadros):
+            return False
+        if quadros == 0:
+            self.quadros = np.zeros(0, dtype=self._tipo_quadro)
+        else:
+            self.quadros = np.memmap(
+                self.caminho, dtype=self._tipo_quadro, mode="r", offset=self._inicio_quadros, shape=(quadros,)
+            )
+        return True
+
+    def corpos(self, quadro=0):
+        """
+        Monta um BodySystem com os dados fixos dos corpos e as posições de um quadro
+
+        Parâmetro:
+            quadro (int): quadro usado para as posições
+
+        Retorna:
+            BodySystem: corpos da trajetória
+        """
+        corpos = BodySystem(capacidade=self.num_corpos)
+        pos = self.pos[quadro] if len(self) else np.zeros((self.num_corpos, 2))
+        corpos.adicionar_lote(
+            self.estatico["massa"],
+            self.estatico["raio"],
+            pos,
+            np.zeros((self.num_corpos, 2)),
+            nome=self.metadados["nomes"],
+            cor=[tuple(cor) for cor in self.estatico["cor"].tolist()],
+            particulaTeste=self.estatico["particulaTeste"],
+            raioOrbital=self.estatico["raioOrbital"],
+        )
+        return corpos
+
+    def fechar(self):
+        self.quadros = None
+
+
+class ReprodutorTrajetoria:
+    """
+    Reproduz uma trajetória gravada, carregando um quadro de cada vez nos vetores de um BodySystem
+
+    Tem o mesmo método passo(dt) do motor de física, podendo ser usado no lugar dele pelo
+    agendador da visualização: cada passo avança um quadro. A posição anterior recebe o quadro
+    anterior, de forma que a interpolação e a velocidade exibida continuam funcionando.
+
+    Atributos:
+        trajetoria (Trajetoria): trajetória reproduzida
+        corpos (BodySystem): corpos que recebem as posições
+        quadro (int): quadro atual
+    """
+
+    def __init__(self, trajetoria, corpos=None):
+        self.trajetoria = trajetoria
+        self.corpos = corpos if corpos is not None else trajetoria.corpos()
+        self.quadro = 0
+        if len(trajetoria):
+            self.ir_para(0)
+
+    def ir_para(self, quadro):
+        """
+        Carrega um quadro qualquer (usado para avançar ou voltar na trajetória)
+
+        Parâmetro:
+            quadro (int): quadro desejado, limitado aos quadros existentes
+        """
+        total = len(self.trajetoria)
+        if total == 0:
+            return
+        self.quadro = min(max(quadro, 0), total - 1)
+        anterior = max(self.quadro - 1, 0)
+        pos = self.trajetoria.pos
+        np.copyto(self.corpos.antPos, pos[anterior])
+        np.copyto(self.corpos.pos, pos[self.quadro])
+        intervalo = self.trajetoria.tempo[self.quadro] - self.trajetoria.tempo[anterior]
+        vel = self.corpos.vel
+        np.subtract(self.corpos.pos, self.corpos.antPos, out=vel)
+        if intervalo > 0:
+            vel /= intervalo
+
+    def passo(self, dt=None):
+        """
+        Avança um quadro; no final da trajetória, procura quadros novos e para se não houver
+
+        Parâmetro:
+            dt (float): ignorado (mantido para ter a mesma assinatura do motor de física)
+        """
+        if self.quadro + 1 >= len(self.trajetoria) and not self.trajetoria.atualizar():
+            # Sem quadros novos: o corpo fica parado no último quadro
+            np.copyto(self.corpos.antPos, self.corpos.pos)
+            return
+        self.ir_para(self.quadro + 1)